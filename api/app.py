@@ -3,18 +3,36 @@ Flask API wrapper for MRZ Scanner
 Deployable using Docker to any platform (AWS ECS Fargate, local server, VPS, Kubernetes, etc.)
 """
 import os
+import re
 import json
-import base64
-import tempfile
 import time
 import sys
+import threading
+from functools import wraps
+from io import BytesIO
 from flask import Flask, request, jsonify, g
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
 from flasgger import Swagger
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from werkzeug.exceptions import RequestEntityTooLarge, TooManyRequests
 import logging
 
+# Try pybase64 first (SIMD-accelerated), fallback to the standard library
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+# Try orjson for faster JSON encoding/decoding, fallback to Flask's default provider
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Add parent directory to path to import mrz_scanner
 # This allows the module to work both when run from api/ and when deployed in Docker
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -27,10 +45,24 @@ from mrz_scanner import process_image, process_pdf
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (used for jsonify and request.get_json)"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+if ORJSON_AVAILABLE:
+    app.json = ORJSONProvider(app)
 CORS(app)  # Enable CORS for Laravel integration
 
-# Initialize Swagger documentation
+# Swagger documentation is opt-in: building the spec walks every route at
+# startup and flasgger adds per-request hooks, so keep it off in production
+ENABLE_DOCS = os.getenv('ENABLE_DOCS', '0') == '1'
+
 swagger_config = {
     "headers": [],
     "specs": [
@@ -69,16 +101,103 @@ swagger_template = {
     ]
 }
 
-swagger = Swagger(app, config=swagger_config, template=swagger_template)
+swagger = Swagger(app, config=swagger_config, template=swagger_template) if ENABLE_DOCS else None
 
-# Initialize rate limiter
-# Use in-memory storage (for production, consider Redis)
-limiter = Limiter(
-    app=app,
-    key_func=lambda: g.api_key if hasattr(g, 'api_key') and g.api_key else get_remote_address(),
-    default_limits=["1000 per hour"],  # Default limit if no API key
-    storage_uri="memory://"
-)
+class SlidingWindowLimiter:
+    """
+    In-process sliding window rate limiter.
+    
+    Approximates a true sliding window with two fixed-window counters per key:
+    estimated = previous_count * (window - elapsed) / window + current_count
+    Counters live in this process only (like the previous memory:// storage),
+    so each gunicorn worker enforces its own limits.
+    """
+    
+    # Drop idle keys once this many are being tracked
+    MAX_TRACKED_KEYS = 10000
+    
+    def __init__(self, clock=time.monotonic):
+        self._windows = {}  # key -> (window_start, previous_count, current_count, window_seconds)
+        self._lock = threading.Lock()
+        self._clock = clock
+    
+    def hit(self, key, limit, window_seconds):
+        """
+        Count a request for key if it is within the limit.
+        
+        Args:
+            key (str): Rate limit bucket (e.g. endpoint + API key or client IP)
+            limit (int): Maximum requests per window
+            window_seconds (float): Window length in seconds
+            
+        Returns:
+            bool: True if the request is allowed, False if the limit is exceeded
+        """
+        now = self._clock()
+        with self._lock:
+            window_start, previous_count, current_count, _ = self._windows.get(key, (now, 0, 0, window_seconds))
+            elapsed = now - window_start
+            if elapsed >= window_seconds:
+                # Roll the window forward; after a full idle window the previous count is stale
+                windows_passed = int(elapsed // window_seconds)
+                previous_count = current_count if windows_passed == 1 else 0
+                current_count = 0
+                window_start += windows_passed * window_seconds
+                elapsed = now - window_start
+            
+            estimated = previous_count * (window_seconds - elapsed) / window_seconds + current_count
+            allowed = estimated < limit
+            if allowed:
+                current_count += 1
+            self._windows[key] = (window_start, previous_count, current_count, window_seconds)
+            
+            if len(self._windows) > self.MAX_TRACKED_KEYS:
+                self._prune(now)
+            return allowed
+    
+    def _prune(self, now):
+        """Forget keys that have been idle for more than two of their own windows"""
+        stale = [k for k, (start, _, _, window_seconds) in self._windows.items() if now - start >= 2 * window_seconds]
+        for k in stale:
+            del self._windows[k]
+
+RATE_LIMIT_PATTERN = re.compile(r'^\s*(\d+)\s*(?:/|per)\s*(\d+)?\s*(second|minute|hour|day)s?\s*$', re.IGNORECASE)
+RATE_LIMIT_UNITS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+def parse_rate_limit(limit_str):
+    """
+    Parse a rate limit string such as "100 per hour", "10/minute" or "50 per 5 minutes".
+    
+    Returns:
+        tuple: (limit, window_seconds)
+    """
+    match = RATE_LIMIT_PATTERN.match(limit_str)
+    if not match:
+        raise ValueError(f"Invalid rate limit: '{limit_str}' (expected e.g. '100 per hour')")
+    limit, multiplier, unit = match.groups()
+    return int(limit), int(multiplier or 1) * RATE_LIMIT_UNITS[unit.lower()]
+
+rate_limiter = SlidingWindowLimiter()
+
+def rate_limited(limit_str):
+    """
+    Limit a view per API key (or per client IP when no key is used).
+    The limit string is parsed once, when the view is decorated.
+    """
+    limit, window_seconds = parse_rate_limit(limit_str)
+    
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            client_key = g.api_key if hasattr(g, 'api_key') and g.api_key else request.remote_addr
+            if not rate_limiter.hit(f"{view.__name__}:{client_key}", limit, window_seconds):
+                raise TooManyRequests(description=limit_str)
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+# Default limit for endpoints without a per-key limit
+DEFAULT_RATE_LIMIT = "1000 per hour"
 
 # Get API keys from environment (optional)
 # Supports multiple keys: comma-separated or space-separated
@@ -90,13 +209,56 @@ if API_KEYS_STR:
     keys = []
     for part in API_KEYS_STR.split(','):
         keys.extend([k.strip() for k in part.split() if k.strip()])
-    API_KEYS = [k for k in keys if k]  # Remove empty strings
+    # frozenset gives O(1) hashed lookup; unlike a list scan it never compares
+    # the provided key character-by-character against every configured key
+    API_KEYS = frozenset(k for k in keys if k)  # Remove empty strings
     logger.info(f"Loaded {len(API_KEYS)} API key(s) from environment")
 
 # Rate limit configuration per API key (can be overridden via env)
 # Format: "100 per hour" or "10 per minute"
 RATE_LIMIT_PER_KEY = os.getenv('RATE_LIMIT_PER_KEY', '100 per hour')
 
+# Pre-serialized bodies for responses that never change between requests
+RESPONSE_AUTH_MISSING = app.json.dumps({
+    "status": "error",
+    "message": "Authentication required. Provide API key via 'Authorization: Bearer <key>' or 'X-API-Key: <key>' header."
+})
+RESPONSE_AUTH_INVALID = app.json.dumps({
+    "status": "error",
+    "message": "Invalid API key. Authentication failed."
+})
+RESPONSE_NO_MRZ_FOUND = app.json.dumps({
+    "status": "failure",
+    "message": "Could not find any valid MRZ data after trying all pages and rotations."
+})
+
+def cached_json_response(body, status):
+    """Build a JSON response from a pre-serialized body"""
+    return app.response_class(body, status=status, mimetype=app.json.mimetype)
+
+# Shared HTTP session for /scan/url downloads
+# Pooled keep-alive connections avoid a TCP/TLS handshake per request
+URL_DOWNLOAD_TIMEOUT = (5, 30)  # (connect, read) seconds
+URL_DOWNLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+http_session = requests.Session()
+http_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=Retry(total=2, backoff_factor=0.2))
+http_session.mount('https://', http_adapter)
+http_session.mount('http://', http_adapter)
+
+# Largest decoded document accepted by the scan endpoints
+MAX_UPLOAD_BYTES = int(os.getenv('MAX_UPLOAD_BYTES', str(50 * 1024 * 1024)))
+# Let Werkzeug reject oversized bodies before buffering them; allow for the
+# 4/3 base64 expansion plus some room for JSON/multipart framing
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_BYTES * 4 // 3 + 64 * 1024
+
+# Base64 characters read per chunk when decoding uploads
+# (87380 characters = 65535 decoded bytes when the input has no whitespace)
+BASE64_CHUNK_CHARS = 87380
+# Whitespace commonly found in wrapped base64 payloads (stripped before decoding)
+BASE64_WHITESPACE = b'\r\n\t '
+# Longest "data:<mediatype>;base64," prefix searched for the comma
+BASE64_DATA_URI_MAX_PREFIX = 256
+
 def get_api_key_from_request():
     """Extract API key from request headers"""
     auth_header = request.headers.get('Authorization', '')
@@ -115,6 +277,119 @@ def get_api_key_from_request():
     
     return None
 
+def decode_base64_to_file(data_b64, file_obj):
+    """
+    Decode base64 data into a binary file object in fixed-size chunks.
+    
+    Each slice of the input is encoded, stripped of whitespace and decoded on
+    its own, so apart from the caller's string and the output only one chunk
+    is held in memory at a time.
+    
+    Args:
+        data_b64 (str or bytes): Base64 encoded data, optionally as a
+            data URI (data:<mediatype>;base64,<data>)
+        file_obj: Writable binary file object (e.g. BytesIO)
+        
+    Raises:
+        ValueError: If the data is not valid base64
+    """
+    if isinstance(data_b64, str):
+        uri_scheme, uri_separator, uri_encoding = 'data:', ',', ';base64'
+    else:
+        uri_scheme, uri_separator, uri_encoding = b'data:', b',', b';base64'
+    # Skip a data URI prefix ("data:image/png;base64,") as sent by browsers'
+    # FileReader.readAsDataURL
+    start = 0
+    if data_b64[:5] == uri_scheme:
+        separator = data_b64.find(uri_separator, 0, BASE64_DATA_URI_MAX_PREFIX)
+        if separator == -1 or not data_b64[:separator].endswith(uri_encoding):
+            raise ValueError("Only base64 encoded data URIs are supported")
+        start = separator + 1
+    
+    # Characters left over after whitespace removal that don't fill a whole
+    # 4-character group are carried into the next chunk
+    remainder = b''
+    for offset in range(start, len(data_b64), BASE64_CHUNK_CHARS):
+        chunk = data_b64[offset:offset + BASE64_CHUNK_CHARS]
+        if isinstance(chunk, str):
+            chunk = chunk.encode('ascii')
+        chunk = remainder + chunk.translate(None, BASE64_WHITESPACE)
+        usable = len(chunk) - len(chunk) % 4
+        if usable:
+            file_obj.write(base64.b64decode(chunk[:usable], validate=True))
+        remainder = chunk[usable:]
+    if remainder:
+        # Truncated input: let the decoder report it
+        base64.b64decode(remainder, validate=True)
+
+def _parse_optional_int(value):
+    """Parse an optional integer field, returning None if missing or invalid"""
+    if value is None or value == '':
+        return None
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
+def parse_scan_options(params):
+    """
+    Extract PDF scan options from a JSON body or form data.
+
+    Args:
+        params: Mapping with optional max_pages, start_page and start_page_only keys
+
+    Returns:
+        tuple: (max_pages, start_page, start_page_only)
+    """
+    start_page_only = params.get('start_page_only', False)
+    if not isinstance(start_page_only, bool):
+        start_page_only = str(start_page_only).lower() in ('true', '1', 'yes', 'on')
+    return (
+        _parse_optional_int(params.get('max_pages')),
+        _parse_optional_int(params.get('start_page')),
+        start_page_only,
+    )
+
+def scan_document(file_buffer, is_pdf, max_pages=None, start_page=None, start_page_only=False):
+    """
+    Run the scanner on an in-memory document and build the API response.
+
+    Args:
+        file_buffer: Binary file object positioned at the start of the document
+        is_pdf (bool): Whether the document is a PDF
+        max_pages (int): Maximum number of PDF pages to process
+        start_page (int): 1-indexed PDF page to try first
+        start_page_only (bool): Only process start_page
+
+    Returns:
+        tuple: (response, status_code)
+    """
+    # Scans run on the request thread: gunicorn's worker threads already bound
+    # how many run at once, and multi-page PDFs fan out to the scanner's page pool
+    start_time = time.perf_counter()
+    if is_pdf:
+        result = process_pdf(file_buffer, show_progress=False, max_pages=max_pages, start_page=start_page, start_page_only=start_page_only)
+    else:
+        result = process_image(file_buffer, show_progress=False)
+    processing_time = round(time.perf_counter() - start_time, 2)
+
+    # Add processing time to result if not already present
+    if result and isinstance(result, dict):
+        result['processing_time_seconds'] = processing_time
+
+    if result and "surname" in result:
+        return jsonify({
+            "status": "success",
+            "data": result,
+            "processing_time_seconds": processing_time
+        }), 200
+    if result and "error" in result:
+        return jsonify({
+            "status": "error",
+            "message": result["error"]
+        }), 500
+    return cached_json_response(RESPONSE_NO_MRZ_FOUND, 200)
+
 def require_auth():
     """Check if authentication is required and validate it"""
     if not API_KEYS:
@@ -125,27 +400,20 @@ def require_auth():
     provided_key = get_api_key_from_request()
     
     if not provided_key:
-        return jsonify({
-            "status": "error",
-            "message": "Authentication required. Provide API key via 'Authorization: Bearer <key>' or 'X-API-Key: <key>' header."
-        }), 401
+        return cached_json_response(RESPONSE_AUTH_MISSING, 401)
     
     # Check if provided key matches any valid key
-    # API_KEYS is always a list at this point
+    # API_KEYS is always a frozenset at this point
     # Normalize the provided key (strip whitespace)
     provided_key_normalized = provided_key.strip()
     
     if provided_key_normalized not in API_KEYS:
-        # Log for debugging (first 10 chars only for security)
-        logger.warning(
-            f"Invalid API key attempt from {get_remote_address()}. "
-            f"Provided key (first 10 chars): '{provided_key_normalized[:10]}...' (length: {len(provided_key_normalized)}), "
-            f"Valid keys count: {len(API_KEYS)}"
+        # Log for debugging (first 10 chars only for security; lazily formatted)
+        logger.debug(
+            "Invalid API key attempt from %s. Provided key prefix: '%s...' (length: %d), Valid keys count: %d",
+            request.remote_addr, provided_key_normalized[:10], len(provided_key_normalized), len(API_KEYS)
         )
-        return jsonify({
-            "status": "error",
-            "message": "Invalid API key. Authentication failed."
-        }), 401
+        return cached_json_response(RESPONSE_AUTH_INVALID, 401)
     
     # Store API key in request context for rate limiting
     g.api_key = provided_key
@@ -162,6 +430,14 @@ def authenticate():
     # Check authentication if API_KEYS is set
     return require_auth()
 
+@app.errorhandler(413)
+def payload_too_large_handler(e):
+    """Handle request bodies larger than MAX_CONTENT_LENGTH"""
+    return jsonify({
+        "status": "error",
+        "message": f"Payload too large (max {MAX_UPLOAD_BYTES} bytes)"
+    }), 413
+
 @app.errorhandler(429)
 def ratelimit_handler(e):
     """Handle rate limit exceeded errors"""
@@ -171,6 +447,7 @@ def ratelimit_handler(e):
     }), 429
 
 @app.route('/health', methods=['GET'])
+@rate_limited(DEFAULT_RATE_LIMIT)
 def health_check():
     """
     Health check endpoint
@@ -198,7 +475,7 @@ def health_check():
     }), 200
 
 @app.route('/scan/base64', methods=['POST'])
-@limiter.limit(RATE_LIMIT_PER_KEY)
+@rate_limited(RATE_LIMIT_PER_KEY)
 def scan_mrz_base64():
     """
     Scan MRZ from Base64 Encoded File
@@ -302,7 +579,7 @@ def scan_mrz_base64():
     """
     try:
         data = request.get_json()
-        if not data:
+        if not isinstance(data, dict) or not data:
             return jsonify({
                 "status": "error",
                 "message": "Request must be JSON with 'file' and 'filename' fields"
@@ -310,81 +587,50 @@ def scan_mrz_base64():
             
         file_data_b64 = data.get('file')
         filename = data.get('filename', 'document.pdf')
-        max_pages = data.get('max_pages')
-        start_page = data.get('start_page')
-        if start_page:
-            try:
-                start_page = int(start_page)
-            except (ValueError, TypeError):
-                start_page = None
-        
-        start_page_only = data.get('start_page_only', False)
-        if start_page_only:
-            try:
-                start_page_only = bool(start_page_only) if isinstance(start_page_only, bool) else str(start_page_only).lower() in ('true', '1', 'yes', 'on')
-            except (ValueError, TypeError):
-                start_page_only = False
+        max_pages, start_page, start_page_only = parse_scan_options(data)
         
         if not file_data_b64:
             return jsonify({
                 "status": "error",
                 "message": "Missing 'file' field with base64 encoded data"
             }), 400
+        if not isinstance(file_data_b64, str):
+            return jsonify({
+                "status": "error",
+                "message": "'file' must be a base64 encoded string"
+            }), 400
+        if not isinstance(filename, str):
+            return jsonify({
+                "status": "error",
+                "message": "'filename' must be a string"
+            }), 400
+        
+        # Reject oversized payloads before decoding anything
+        if len(file_data_b64) * 3 // 4 > MAX_UPLOAD_BYTES:
+            return jsonify({
+                "status": "error",
+                "message": f"Payload too large (max {MAX_UPLOAD_BYTES} bytes)"
+            }), 413
         
-        # Decode base64 file
+        # Determine file type
+        is_pdf = filename[-4:].lower() == '.pdf'
+        
+        # Decode base64 straight into an in-memory buffer
+        file_buffer = BytesIO()
         try:
-            file_data = base64.b64decode(file_data_b64)
+            decode_base64_to_file(file_data_b64, file_buffer)
         except Exception as e:
             return jsonify({
                 "status": "error",
                 "message": f"Invalid base64 encoding: {str(e)}"
             }), 400
+        file_buffer.seek(0)
         
-        # Determine file type
-        is_pdf = filename.lower().endswith('.pdf')
-        
-        # Save to temporary file
-        suffix = '.pdf' if is_pdf else '.jpg'
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
-            temp_path = temp_file.name
-            temp_file.write(file_data)
-        
-        try:
-            # Process the file with timing
-            start_time = time.time()
-            if is_pdf:
-                result = process_pdf(temp_path, show_progress=False, max_pages=max_pages, start_page=start_page, start_page_only=start_page_only)
-            else:
-                result = process_image(temp_path, show_progress=False)
-            processing_time = round(time.time() - start_time, 2)
+        return scan_document(file_buffer, is_pdf, max_pages, start_page, start_page_only)
             
-            # Add processing time to result if not already present
-            if result and isinstance(result, dict):
-                result['processing_time_seconds'] = processing_time
-            
-            # Format response
-            if result and "surname" in result:
-                return jsonify({
-                    "status": "success",
-                    "data": result,
-                    "processing_time_seconds": processing_time
-                }), 200
-            elif result and "error" in result:
-                return jsonify({
-                    "status": "error",
-                    "message": result["error"]
-                }), 500
-            else:
-                return jsonify({
-                    "status": "failure",
-                    "message": "Could not find any valid MRZ data after trying all pages and rotations."
-                }), 200
-                
-        finally:
-            # Cleanup temporary file
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-                
+    except RequestEntityTooLarge:
+        # Body exceeded MAX_CONTENT_LENGTH; let the 413 handler respond
+        raise
     except Exception as e:
         logger.error(f"Error processing MRZ scan: {str(e)}", exc_info=True)
         return jsonify({
@@ -393,7 +639,7 @@ def scan_mrz_base64():
         }), 500
 
 @app.route('/scan/file', methods=['POST'])
-@limiter.limit(RATE_LIMIT_PER_KEY)
+@rate_limited(RATE_LIMIT_PER_KEY)
 def scan_mrz_file():
     """
     Scan MRZ from File Upload
@@ -496,68 +742,28 @@ def scan_mrz_file():
         
         file = request.files['file']
         filename = file.filename or 'document.pdf'
-        file_data = file.read()
-        max_pages = request.form.get('max_pages')
-        if max_pages:
-            try:
-                max_pages = int(max_pages)
-            except ValueError:
-                max_pages = None
-        
-        start_page = request.form.get('start_page')
-        if start_page:
-            try:
-                start_page = int(start_page)
-            except ValueError:
-                start_page = None
         
-        start_page_only = request.form.get('start_page_only', 'false').lower() in ('true', '1', 'yes', 'on')
+        # MAX_CONTENT_LENGTH leaves room for base64 expansion, so check the file itself
+        file.stream.seek(0, os.SEEK_END)
+        file_size = file.stream.tell()
+        file.stream.seek(0)
+        if file_size > MAX_UPLOAD_BYTES:
+            return jsonify({
+                "status": "error",
+                "message": f"Payload too large (max {MAX_UPLOAD_BYTES} bytes)"
+            }), 413
+        max_pages, start_page, start_page_only = parse_scan_options(request.form)
         
         # Determine file type
-        is_pdf = filename.lower().endswith('.pdf')
+        is_pdf = filename[-4:].lower() == '.pdf'
         
-        # Save to temporary file
-        suffix = '.pdf' if is_pdf else '.jpg'
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
-            temp_path = temp_file.name
-            temp_file.write(file_data)
-        
-        try:
-            # Process the file with timing
-            start_time = time.time()
-            if is_pdf:
-                result = process_pdf(temp_path, show_progress=False, max_pages=max_pages, start_page=start_page, start_page_only=start_page_only)
-            else:
-                result = process_image(temp_path, show_progress=False)
-            processing_time = round(time.time() - start_time, 2)
-            
-            # Add processing time to result if not already present
-            if result and isinstance(result, dict):
-                result['processing_time_seconds'] = processing_time
+        # Scan straight from Werkzeug's spooled upload stream instead of
+        # copying the whole body into a bytes object first
+        return scan_document(file.stream, is_pdf, max_pages, start_page, start_page_only)
             
-            # Format response
-            if result and "surname" in result:
-                return jsonify({
-                    "status": "success",
-                    "data": result,
-                    "processing_time_seconds": processing_time
-                }), 200
-            elif result and "error" in result:
-                return jsonify({
-                    "status": "error",
-                    "message": result["error"]
-                }), 500
-            else:
-                return jsonify({
-                    "status": "failure",
-                    "message": "Could not find any valid MRZ data after trying all pages and rotations."
-                }), 200
-                
-        finally:
-            # Cleanup temporary file
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-                
+    except RequestEntityTooLarge:
+        # Body exceeded MAX_CONTENT_LENGTH; let the 413 handler respond
+        raise
     except Exception as e:
         logger.error(f"Error processing MRZ scan: {str(e)}", exc_info=True)
         return jsonify({
@@ -566,7 +772,7 @@ def scan_mrz_file():
         }), 500
 
 @app.route('/scan/url', methods=['POST'])
-@limiter.limit(RATE_LIMIT_PER_KEY)
+@rate_limited(RATE_LIMIT_PER_KEY)
 def scan_from_url():
     """
     Scan MRZ from a URL
@@ -645,83 +851,58 @@ def scan_from_url():
             }), 400
         
         url = data['url']
-        max_pages = data.get('max_pages')
-        start_page = data.get('start_page')
-        if start_page:
-            try:
-                start_page = int(start_page)
-            except (ValueError, TypeError):
-                start_page = None
-        
-        start_page_only = data.get('start_page_only', False)
-        if start_page_only:
-            try:
-                start_page_only = bool(start_page_only) if isinstance(start_page_only, bool) else str(start_page_only).lower() in ('true', '1', 'yes', 'on')
-            except (ValueError, TypeError):
-                start_page_only = False
+        max_pages, start_page, start_page_only = parse_scan_options(data)
         
         # Extract file extension from URL (handle query parameters)
         from urllib.parse import urlparse
-        parsed_url = urlparse(url)
-        url_path = parsed_url.path.lower()
-        is_pdf = url_path.endswith('.pdf')
-        file_ext = '.pdf' if is_pdf else '.jpg'
+        url_path = urlparse(url).path
+        is_pdf = url_path[-4:].lower() == '.pdf'
         
-        # Download file from URL
-        import urllib.request
-        import urllib.error
+        # Download file from URL (streamed into memory over pooled connections)
+        download_error = None
+        file_too_large = False
+        file_buffer = BytesIO()
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as temp_file:
-                temp_path = temp_file.name
-                urllib.request.urlretrieve(url, temp_path)
-        except urllib.error.HTTPError as e:
-            return jsonify({
-                "status": "error",
-                "message": f"Failed to download file from URL: HTTP {e.code} {e.reason}. The URL may have expired or be invalid."
-            }), 400
-        except urllib.error.URLError as e:
+            with http_session.get(url, stream=True, timeout=URL_DOWNLOAD_TIMEOUT) as response:
+                response.raise_for_status()
+                # Refuse up front when the server declares an oversized body
+                content_length = response.headers.get('Content-Length')
+                if content_length and content_length.isdigit() and int(content_length) > MAX_UPLOAD_BYTES:
+                    file_too_large = True
+                else:
+                    for chunk in response.iter_content(chunk_size=URL_DOWNLOAD_CHUNK_SIZE):
+                        file_buffer.write(chunk)
+                        # Stop reading once past the limit instead of buffering the whole body
+                        if file_buffer.tell() > MAX_UPLOAD_BYTES:
+                            file_too_large = True
+                            break
+        except Exception as e:
+            download_error = e
+        
+        if file_too_large:
             return jsonify({
                 "status": "error",
-                "message": f"Failed to download file from URL: {str(e)}"
-            }), 400
-        except Exception as e:
+                "message": f"Payload too large (max {MAX_UPLOAD_BYTES} bytes)"
+            }), 413
+        
+        if download_error is not None:
+            if isinstance(download_error, requests.exceptions.HTTPError):
+                message = f"Failed to download file from URL: HTTP {download_error.response.status_code} {download_error.response.reason}. The URL may have expired or be invalid."
+            elif isinstance(download_error, requests.exceptions.RequestException):
+                message = f"Failed to download file from URL: {str(download_error)}"
+            else:
+                message = f"Failed to download file: {str(download_error)}"
             return jsonify({
                 "status": "error",
-                "message": f"Failed to download file: {str(e)}"
+                "message": message
             }), 400
+        file_buffer.seek(0)
         
-        try:
-            # Process the file with timing
-            start_time = time.time()
-            if is_pdf:
-                result = process_pdf(temp_path, show_progress=False, max_pages=max_pages, start_page=start_page, start_page_only=start_page_only)
-            else:
-                result = process_image(temp_path, show_progress=False)
-            processing_time = round(time.time() - start_time, 2)
-            if result and isinstance(result, dict):
-                result['processing_time_seconds'] = processing_time
-                
-            if result and "surname" in result:
-                return jsonify({
-                    "status": "success",
-                    "data": result,
-                    "processing_time_seconds": processing_time
-                }), 200
-            elif result and "error" in result:
-                return jsonify({
-                    "status": "error",
-                    "message": result["error"]
-                }), 500
-            else:
-                return jsonify({
-                    "status": "failure",
-                    "message": "Could not find any valid MRZ data after trying all pages and rotations."
-                }), 200
-                
-        finally:
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-                
+        return scan_document(file_buffer, is_pdf, max_pages, start_page, start_page_only)
+            
+    except RequestEntityTooLarge:
+        # Body exceeded MAX_CONTENT_LENGTH; let the 413 handler respond
+        raise
     except Exception as e:
         logger.error(f"Error processing MRZ scan from URL: {str(e)}", exc_info=True)
         return jsonify({
@@ -729,7 +910,36 @@ def scan_from_url():
             "message": f"Internal server error: {str(e)}"
         }), 500
 
+def warmup_scanner():
+    """
+    Run one scan on a blank in-memory image at startup.
+    
+    This imports the OCR libraries, pulls the MRZ model file and Tesseract's
+    language data into the OS page cache, and logs a broken OCR setup before
+    the first request. The FastMRZ network and Tesseract API are per thread,
+    so every request thread still loads its own on its first scan.
+    Only an image is scanned, so no PDF page pool is started in the gunicorn
+    master before it forks.
+    """
+    from PIL import Image
+    start_time = time.perf_counter()
+    image_buffer = BytesIO()
+    Image.new('RGB', (600, 400), 'white').save(image_buffer, format='PNG')
+    image_buffer.seek(0)
+    try:
+        process_image(image_buffer, show_progress=False)
+    except Exception as e:
+        logger.warning(f"Scanner warmup failed: {str(e)}")
+        return
+    logger.info(f"Scanner warmed up in {time.perf_counter() - start_time:.2f}s")
+
+# With gunicorn's preload_app this runs once in the master; workers inherit the
+# imported modules, not the master thread's loaded models
+if os.getenv('WARMUP', '0') == '1':
+    warmup_scanner()
+
 if __name__ == '__main__':
+    # Development server only; production runs under gunicorn (gunicorn -c gunicorn.conf.py app:app)
     # Get port from environment or default to 5000
     port = int(os.getenv('PORT', 5000))
     host = os.getenv('HOST', '0.0.0.0')
@@ -0,0 +1,69 @@
+"""
+Gunicorn configuration for the MRZ Scanner API
+Usage: gunicorn -c gunicorn.conf.py app:app
+"""
+import multiprocessing
+import os
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5000')}"
+
+# Approximate memory (MiB) per part of a worker. Every request thread loads its
+# own FastMRZ network and Tesseract API (about 40 MiB) on its first scan and
+# needs room for the decoded images on top; every PDF page worker process
+# imports the scanner and loads the same models again.
+WORKER_BASE_MB = int(os.getenv('GUNICORN_WORKER_BASE_MB', '150'))
+THREAD_MB = int(os.getenv('GUNICORN_THREAD_MB', '150'))
+PAGE_WORKER_MB = int(os.getenv('GUNICORN_PAGE_WORKER_MB', '200'))
+
+
+def memory_budget_mb():
+    """Memory available to the server: GUNICORN_MEMORY_MB, the cgroup limit, or physical RAM"""
+    if os.getenv('GUNICORN_MEMORY_MB'):
+        return int(os.getenv('GUNICORN_MEMORY_MB'))
+    for path in ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory/memory.limit_in_bytes'):
+        try:
+            with open(path) as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        if value.isdigit() and int(value) < 1 << 50:  # "max" or a huge number means unlimited
+            return int(value) // (1 << 20)
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') // (1 << 20)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+# Threaded workers keep serving other requests while one thread waits on a
+# download or OCR; each thread runs at most one scan, so workers x threads bounds
+# concurrent scans. 'gevent' (pip install gevent) or 'meinheld' can be used
+# instead for download-heavy workloads, but a scan then blocks the worker's
+# event loop (OCR is CPU-bound and runs in the request greenlet).
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.getenv('GUNICORN_THREADS', '2'))
+
+# Worker processes: one per CPU (OCR is CPU-bound), but no more than fit in
+# the memory budget with their threads' models and PDF page workers (the
+# scanner only starts a page pool when PDF_PAGE_WORKERS is above 1)
+cpu_count = multiprocessing.cpu_count()
+page_workers = int(os.getenv('PDF_PAGE_WORKERS', str(max(1, cpu_count // 4))))
+worker_mb = WORKER_BASE_MB + threads * THREAD_MB + (page_workers * PAGE_WORKER_MB if page_workers > 1 else 0)
+budget_mb = memory_budget_mb()
+default_workers = cpu_count
+if budget_mb:
+    # Leave a fifth of the memory for the master, page cache and request bodies
+    default_workers = min(default_workers, budget_mb * 4 // 5 // worker_mb)
+workers = int(os.getenv('GUNICORN_WORKERS', str(max(1, default_workers))))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', '500'))  # gevent/eventlet only
+
+# Import the app (and warm the scanner when WARMUP=1) once in the master so
+# workers fork with the OCR libraries already imported. Models are still
+# loaded per request thread, on its first scan.
+preload_app = os.getenv('GUNICORN_PRELOAD', '1') == '1'
+
+# Multi-page PDFs can take a while to OCR
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '300'))
+keepalive = 5
+
+accesslog = '-'
+errorlog = '-'
@@ -1,15 +1,38 @@
 import sys
 import os
+
+# Keep native thread pools single-threaded unless configured otherwise. Parallelism
+# comes from page worker processes and API request threads; oversubscribed OpenMP
+# and BLAS pools only spin against each other. Must be set before cv2, numpy and
+# Tesseract are loaded.
+for _thread_var in ('OMP_THREAD_LIMIT', 'OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS'):
+    os.environ.setdefault(_thread_var, '1')
+
 import json
+import re
 import argparse
-import tempfile
+import hashlib
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from io import BytesIO
+import multiprocessing
+from multiprocessing import shared_memory
+import itertools
+from functools import partial
+import cv2
+import numpy as np
 from fastmrz import FastMRZ
 from PIL import Image
 import pytesseract
 from dotenv import load_dotenv
 
+# Try tesserocr first (in-process Tesseract API, no subprocess per OCR call), fallback to pytesseract
+try:
+    from tesserocr import PyTessBaseAPI, PSM, OEM
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
 # Try PyMuPDF first (faster), fallback to pdf2image
 try:
     import fitz  # PyMuPDF
@@ -17,39 +40,621 @@ try:
 except ImportError:
     PYMUPDF_AVAILABLE = False
     try:
-        from pdf2image import convert_from_path, pdfinfo_from_path
+        from pdf2image import convert_from_path, convert_from_bytes, pdfinfo_from_path, pdfinfo_from_bytes
     except ImportError:
         convert_from_path = None
+        convert_from_bytes = None
         pdfinfo_from_path = None
+        pdfinfo_from_bytes = None
+
+# Optional on-disk cache of per-page results (only used when MRZ_CACHE_DIR is set)
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+# Optional multi-pattern prefilter for MRZ lines in OCR text (falls back to re)
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
 
 # Load environment variables from .env file
 load_dotenv()
 
 # Get configuration from environment variables with fallback defaults
 TESSERACT_PATH = os.getenv('TESSERACT_PATH', r'C:\Program Files\Tesseract-OCR\tesseract.exe')
-PDF_DPI = int(os.getenv('PDF_DPI', '300'))
-PDF_DPI_FAST = int(os.getenv('PDF_DPI_FAST', '200'))  # Lower DPI for faster processing (priority pages)
+PDF_DPI = int(os.getenv('PDF_DPI', '150'))
+PDF_DPI_FAST = int(os.getenv('PDF_DPI_FAST', '100'))  # First-pass DPI for every page (MRZ text is still legible)
 OCR_PSM_MODE = int(os.getenv('OCR_PSM_MODE', '6'))
 OCR_PSM_MODE_FAST = int(os.getenv('OCR_PSM_MODE_FAST', '11'))  # Faster PSM mode for known pages
+# Tesseract language(s) for MRZ text, e.g. 'ocrb+mrz' if ocrb.traineddata is installed
+OCR_LANG = os.getenv('OCR_LANG', 'mrz')
+# Restricting output to the MRZ alphabet prunes the recognizer's alternatives
+MRZ_CHAR_WHITELIST = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789<'
+# Document code + issuing country that opens the first MRZ line (e.g. P<GBR, I<UTO)
+MRZ_FIRST_LINE_PATTERN = re.compile(r'[ACIPV][A-Z<][A-Z<]{3}')
+# A whole first MRZ line (30-44 characters), matched per line of OCR text
+MRZ_FIRST_LINE_EXPRESSION = r'^[ACIPV][A-Z<][A-Z<]{3}[A-Z0-9<]{25,}$'
+MRZ_FIRST_LINE_REGEX = re.compile(MRZ_FIRST_LINE_EXPRESSION, re.MULTILINE)
+# Render PDF pages as grayscale (a third of the pixel data). Off by default: the
+# MRZ segmentation model was trained on colour images and misses some pages in gray
+PDF_RENDER_GRAYSCALE = os.getenv('PDF_RENDER_GRAYSCALE', '0').lower() in ('1', 'true', 'yes')
+# Debug: write page 3 of each PDF to page_3_inspection_<name>.png
+SAVE_PAGE3_INSPECTION = os.getenv('MRZ_SAVE_PAGE3_INSPECTION', '').lower() in ('1', 'true', 'yes')
 MAX_IMAGE_DIMENSION = int(os.getenv('MAX_IMAGE_DIMENSION', '4000'))  # Resize images larger than this (increased to avoid breaking MRZ detection)
+# MRZ line height (px) the detected band is scaled to before OCR
+MRZ_OCR_LINE_HEIGHT = 32
+# Worker processes for scanning PDF pages in parallel (each runs single-threaded
+# Tesseract and loads its own OCR models). Every process that scans PDFs (each
+# gunicorn worker, for the API) starts one pool of this size, so the default is
+# a quarter of the CPUs; 1 scans pages sequentially without a pool
+PDF_PAGE_WORKERS = int(os.getenv('PDF_PAGE_WORKERS', str(max(1, (os.cpu_count() or 1) // 4))))
+# Directory for caching page results across runs. Cached results contain passport
+# data, so caching is off unless a directory is configured
+MRZ_CACHE_DIR = os.getenv('MRZ_CACHE_DIR')
+MRZ_CACHE_SIZE_LIMIT = int(os.getenv('MRZ_CACHE_SIZE_LIMIT', str(1 << 30)))
 # Default max pages: None means all pages, or set a number to limit
 MAX_PAGES_DEFAULT = os.getenv('MAX_PAGES_DEFAULT')
 MAX_PAGES_DEFAULT = int(MAX_PAGES_DEFAULT) if MAX_PAGES_DEFAULT and MAX_PAGES_DEFAULT.lower() != 'none' else None
 
 
+# One Tesseract API and one FastMRZ per thread: both keep their models loaded
+# between calls, but neither may be used from several threads at once
+# (the segmentation network's setInput/forward pair is stateful)
+_thread_local = threading.local()
+
+
+class OCRConfigurationError(RuntimeError):
+    """
+    Tesseract cannot run with the configured language data or executable.
+    
+    Unlike OCR failures on a single image, this is not caught per rotation or
+    per page: every scan would fail the same way, so it is reported as an error
+    instead of "no MRZ found".
+    """
+
+
+# First Tesseract setup failure, re-raised on later calls instead of retrying
+_tesseract_init_error = None
+
+
+def _get_tesseract_api():
+    """Return this thread's tesserocr API, initializing it on first use"""
+    global _tesseract_init_error
+    api = getattr(_thread_local, 'api', None)
+    if api is None:
+        if _tesseract_init_error is not None:
+            raise _tesseract_init_error
+        try:
+            api = PyTessBaseAPI(lang=OCR_LANG, psm=PSM.SINGLE_BLOCK, oem=OEM.LSTM_ONLY)
+        except RuntimeError as e:
+            _tesseract_init_error = OCRConfigurationError(
+                f"Tesseract could not load language '{OCR_LANG}' ({e}). "
+                f"Check TESSDATA_PREFIX and that {OCR_LANG}.traineddata is installed."
+            )
+            raise _tesseract_init_error from e
+        api.SetVariable('tessedit_char_whitelist', MRZ_CHAR_WHITELIST)
+        _thread_local.api = api
+    return api
+
+
+def ocr_mrz_text(image, psm_mode=OCR_PSM_MODE):
+    """
+    Run Tesseract with the MRZ language model (OCR_LANG) on an image.
+    
+    Uses the persistent tesserocr API when installed, otherwise pytesseract
+    (which starts a tesseract process and reloads the model on every call).
+    
+    Args:
+        image (PIL.Image or numpy.ndarray): Image to read (grayscale, RGB or RGBA)
+        psm_mode (int): Tesseract page segmentation mode
+        
+    Returns:
+        str: Recognized text
+        
+    Raises:
+        OCRConfigurationError: If Tesseract or its language data can't be loaded
+    """
+    if TESSEROCR_AVAILABLE:
+        if isinstance(image, Image.Image):
+            image = np.asarray(image if image.mode in ('L', 'RGB', 'RGBA') else image.convert('RGB'))
+        # Hand Tesseract the raw pixel buffer; SetImage(PIL) would encode and decode an image file
+        image = np.ascontiguousarray(image, dtype=np.uint8)
+        height, width = image.shape[:2]
+        bytes_per_pixel = 1 if image.ndim == 2 else image.shape[2]
+        api = _get_tesseract_api()
+        api.SetPageSegMode(psm_mode)
+        api.SetImageBytes(image.tobytes(), width, height, bytes_per_pixel, width * bytes_per_pixel)
+        return api.GetUTF8Text()
+    global _tesseract_init_error
+    if _tesseract_init_error is not None:
+        raise _tesseract_init_error
+    try:
+        return pytesseract.image_to_string(image, config=f'--oem 3 --psm {psm_mode} -l {OCR_LANG} -c tessedit_char_whitelist={MRZ_CHAR_WHITELIST}')
+    except pytesseract.TesseractNotFoundError as e:
+        _tesseract_init_error = OCRConfigurationError(f"Tesseract executable not found ({e}). Set TESSERACT_PATH or add it to PATH.")
+        raise _tesseract_init_error from e
+    except pytesseract.TesseractError as e:
+        if 'Failed loading language' not in str(e):
+            raise
+        _tesseract_init_error = OCRConfigurationError(
+            f"Tesseract could not load language '{OCR_LANG}' ({e}). "
+            f"Check TESSDATA_PREFIX and that {OCR_LANG}.traineddata is installed."
+        )
+        raise _tesseract_init_error from e
+
+
+class FastMRZReader(FastMRZ):
+    """
+    FastMRZ with the MRZ region read through ocr_mrz_text().
+    
+    The segmentation model and ROI extraction are the same as FastMRZ._get_roi;
+    only the final OCR call is replaced so it can use the in-process tesserocr API.
+    """
+    
+    last_mask_fraction = None  # Set by _get_roi for the most recent image
+    
+    def has_mrz_region(self, image_array, min_fraction=0.005):
+        """
+        Cheap check (one pass of the 256x256 segmentation model, no OCR) for
+        whether an image contains an MRZ-like band.
+        
+        Args:
+            image_array (numpy.ndarray): RGB image array
+            min_fraction (float): Share of the segmentation mask that must be MRZ
+            
+        Returns:
+            bool: True if the model marks enough of the image as MRZ
+        """
+        self.net.setInput(self._process_image(image_array))
+        output_data = self.net.forward()
+        return float((output_data[0, :, :, 0] > 0.25).mean()) >= min_fraction
+    
+    def _get_roi(self, output_data, image_path):
+        image = cv2.imread(image_path, cv2.IMREAD_COLOR) if isinstance(image_path, str) else image_path
+        
+        output_data = np.uint8((output_data[0, :, :, 0] > 0.25) * 255)
+        # Share of the mask marked as MRZ, before erosion drops weak (e.g. sideways) regions
+        self.last_mask_fraction = float(np.count_nonzero(output_data)) / output_data.size
+        altered_image = cv2.resize(output_data, (image.shape[1], image.shape[0]))
+        altered_image = cv2.erode(altered_image, np.ones((5, 5), dtype=np.float32), iterations=1)
+        
+        contours, _ = cv2.findContours(altered_image, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_NONE)
+        if len(contours) == 0:
+            return ""
+        
+        # Pad the largest detected region and binarize it before OCR
+        x, y, w, h = cv2.boundingRect(max(contours, key=cv2.contourArea))
+        padding = 10
+        roi_arr = image[max(0, y - padding):min(image.shape[0], y + h + padding),
+                        max(0, x - padding):min(image.shape[1], x + w + padding)]
+        roi_gray = cv2.cvtColor(roi_arr, cv2.COLOR_BGR2GRAY)
+        roi_threshold = cv2.threshold(roi_gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
+        
+        # FastMRZ reads the region as a single block of text (PSM 6)
+        return ocr_mrz_text(roi_threshold, psm_mode=6)
+
+
+def _get_fast_mrz():
+    """Return this thread's FastMRZReader, loading the segmentation model on first use"""
+    fast_mrz = getattr(_thread_local, 'fast_mrz', None)
+    if fast_mrz is None:
+        # Use TESSERACT_PATH from environment, or empty string if not set (will use system PATH)
+        fast_mrz = FastMRZReader(tesseract_path=TESSERACT_PATH if TESSERACT_PATH else "")
+        _thread_local.fast_mrz = fast_mrz
+    return fast_mrz
+
+
+# Pages of each parallel scan that no worker has started yet, shared with the
+# page workers (one slot per scan_id % PAGE_SCAN_SLOTS). A scan sets its slot
+# to 0 when it ends, which also cancels the pages still queued.
+PAGE_SCAN_SLOTS = 1024
+
+# Per-worker-process state for parallel PDF scans: the shared pending page
+# counts, and the PDF and document of the scan this worker is serving, kept
+# for that scan's other pages
+_worker_pending_pages = None
+_worker_scan_id = None
+_worker_pdf = None
+_worker_doc = None
+
+
+def _page_worker_init(pending_pages=None):
+    """
+    Initializer for PDF page worker processes.
+    
+    Limits Tesseract to one OpenMP thread (several multi-threaded Tesseracts
+    running side by side only contend for the same cores) and loads the OCR
+    models up front so the first page doesn't pay for them.
+    
+    Args:
+        pending_pages: Shared array of per-scan counts of pages not yet started
+    """
+    global _worker_pending_pages
+    _worker_pending_pages = pending_pages
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+    try:
+        _get_fast_mrz()
+        if TESSEROCR_AVAILABLE:
+            _get_tesseract_api()
+    except Exception:
+        pass  # Setup errors are raised again by the first page scan
+
+
+def _release_worker_pdf():
+    """Close the document this page worker kept for its current scan"""
+    global _worker_scan_id, _worker_pdf, _worker_doc
+    if _worker_doc is not None:
+        try:
+            _worker_doc.close()
+        except Exception:
+            pass
+    _worker_scan_id = None
+    _worker_pdf = None
+    _worker_doc = None
+
+
+def _read_shared_pdf(pdf_source):
+    """
+    Resolve the PDF source a scan handed to the page workers.
+    
+    Args:
+        pdf_source (str or tuple): Path to the PDF file, or (shared memory name,
+            size) for in-memory PDFs
+        
+    Returns:
+        str or bytes: Path to the PDF file or raw PDF bytes
+    """
+    if not isinstance(pdf_source, tuple):
+        return pdf_source
+    name, size = pdf_source
+    shared_pdf = shared_memory.SharedMemory(name=name)
+    try:
+        return bytes(shared_pdf.buf[:size])
+    finally:
+        shared_pdf.close()
+
+
+def _process_worker_page(scan_id, pdf_source, page_num, total_pages, show_progress=False, fingerprint=None):
+    """
+    Scan one page in a page worker process, returning (page_num, result).
+    
+    The PDF is read and opened once per scan (scan_id) and worker, and reused
+    for every further page of that scan the worker is given. It is released as
+    soon as the scan has no pages left to start. Pages of a scan that has
+    ended or been cancelled meanwhile are skipped.
+    """
+    global _worker_scan_id, _worker_pdf, _worker_doc
+    slot = scan_id % PAGE_SCAN_SLOTS
+    with _worker_pending_pages.get_lock():
+        if _worker_pending_pages[slot] <= 0:
+            return page_num, None
+        _worker_pending_pages[slot] -= 1
+        if scan_id != _worker_scan_id:
+            _release_worker_pdf()
+            # Read while holding the lock: the scan can't end and free the
+            # shared memory before this page has its copy
+            _worker_pdf = _read_shared_pdf(pdf_source)
+            _worker_scan_id = scan_id
+            if PYMUPDF_AVAILABLE:
+                try:
+                    _worker_doc = _open_pdf_document(_worker_pdf)
+                except Exception:
+                    _worker_doc = None  # Fallback to opening per page
+    try:
+        return page_num, _process_single_page(_worker_pdf, page_num, total_pages, show_progress, _worker_doc, fingerprint=fingerprint)
+    finally:
+        if _worker_pending_pages[slot] <= 0:
+            _release_worker_pdf()
+
+
+def _get_page_pool_context():
+    """
+    Multiprocessing context for the page worker pool.
+    
+    Uses forkserver where available, since forking a process that already runs
+    threads (Flask, gunicorn gthread) can deadlock; otherwise spawn.
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        # Import the scanner once in the fork server instead of in every worker
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context('spawn')
+
+
+_page_pool = None
+_page_pending_pages = None
+_page_pool_pid = None
+_page_pool_lock = threading.Lock()
+# Identifies each parallel scan to the page workers (and picks its pending page slot)
+_page_scan_ids = itertools.count()
+
+
+def _get_page_pool():
+    """
+    Return this process's PDF page worker pool, starting it on first use.
+    
+    The pool lives as long as the process and is shared by every scan (and
+    thread), so workers load their OCR models once rather than per PDF.
+    Started lazily per process, so a gunicorn master that preloads the app
+    doesn't fork its workers with a pool they can't use.
+    
+    Returns:
+        tuple: (multiprocessing.pool.Pool, shared array of per-scan pending page counts)
+    """
+    global _page_pool, _page_pending_pages, _page_pool_pid
+    with _page_pool_lock:
+        if _page_pool is None or _page_pool_pid != os.getpid():
+            context = _get_page_pool_context()
+            _page_pending_pages = context.Array('i', PAGE_SCAN_SLOTS)
+            _page_pool = context.Pool(processes=PDF_PAGE_WORKERS, initializer=_page_worker_init, initargs=(_page_pending_pages,))
+            _page_pool_pid = os.getpid()
+        return _page_pool, _page_pending_pages
+
+
+def _to_rgb_array(image):
+    """Convert a PIL image to the 3-channel array FastMRZ expects for numpy input"""
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    return np.asarray(image)
+
+
+# Stored for pages without an MRZ so negatives are cached too
+_NO_MRZ_CACHED = "no-mrz"
+# Bump when a scanner change can alter page results, so older entries are ignored
+PAGE_CACHE_VERSION = 1
+_page_cache = None
+_page_cache_pid = None
+
+
+def _get_page_cache():
+    """
+    Return this process's page result cache, or None if caching is disabled.
+    Opened lazily per process so forked page workers don't share a connection.
+    """
+    global _page_cache, _page_cache_pid
+    if not (DISKCACHE_AVAILABLE and MRZ_CACHE_DIR):
+        return None
+    if _page_cache is None or _page_cache_pid != os.getpid():
+        _page_cache = diskcache.Cache(MRZ_CACHE_DIR, size_limit=MRZ_CACHE_SIZE_LIMIT)
+        _page_cache_pid = os.getpid()
+    return _page_cache
+
+
+def _pdf_fingerprint(pdf_path):
+    """
+    Identify a PDF for caching: size, mtime and the first 4 KB for files,
+    or a hash of the full contents for in-memory PDFs.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(pdf_path, bytes):
+        digest.update(pdf_path)
+    else:
+        stat = os.stat(pdf_path)
+        digest.update(f"{stat.st_size}:{stat.st_mtime_ns}:".encode())
+        with open(pdf_path, 'rb') as f:
+            digest.update(f.read(4096))
+    return digest.hexdigest()
+
+
+def _page_cache_key(fingerprint, page_num, use_fast_dpi):
+    """
+    Cache key for one page result: the PDF, the page, and every setting that
+    changes what scanning the page returns.
+    """
+    return (PAGE_CACHE_VERSION, fingerprint, page_num, use_fast_dpi, OCR_LANG, OCR_PSM_MODE, OCR_PSM_MODE_FAST,
+            PDF_DPI_FAST, PDF_DPI, PDF_RENDER_GRAYSCALE, MAX_IMAGE_DIMENSION, MRZ_OCR_LINE_HEIGHT)
+
+
+def _rotate_array(image_array, angle):
+    """
+    Rotate an image array clockwise by angle degrees, matching PIL's rotate(-angle, expand=True).
+    
+    Right angles use cv2.rotate (a tiled, SIMD transpose with no resampling);
+    any other angle falls back to PIL.
+    """
+    angle %= 360
+    if angle == 0:
+        return image_array
+    if angle == 90:
+        return cv2.rotate(image_array, cv2.ROTATE_90_CLOCKWISE)
+    if angle == 180:
+        return cv2.rotate(image_array, cv2.ROTATE_180)
+    if angle == 270:
+        return cv2.rotate(image_array, cv2.ROTATE_90_COUNTERCLOCKWISE)
+    return np.asarray(Image.fromarray(image_array).rotate(-angle, expand=True))
+
+
+def find_mrz_band(image_array, min_aspect=10, line_height=MRZ_OCR_LINE_HEIGHT):
+    """
+    Locate the MRZ with plain binary morphology (no model, no OCR).
+    
+    Otsu-binarizes the image, closes the gaps between characters horizontally
+    and keeps long, thin bands spanning at least half the image width. The MRZ
+    is taken to be the two lowest such bands. The crop is rescaled so the MRZ
+    lines are about line_height pixels tall and binarized, which is the input
+    size Tesseract reads most reliably.
+    
+    Args:
+        image_array (numpy.ndarray): RGB image array
+        min_aspect (int): Minimum width/height ratio of a text band
+        line_height (int): Target MRZ line height in pixels
+        
+    Returns:
+        numpy.ndarray: Binary (black on white) crop around the MRZ lines,
+            or None if fewer than two bands were found
+    """
+    gray = cv2.cvtColor(image_array, cv2.COLOR_RGB2GRAY)
+    height, width = gray.shape
+    binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)[1]
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (max(15, width // 40), 3))
+    closed = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
+    contours, _ = cv2.findContours(closed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    
+    bands = []
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        if h >= 8 and w > min_aspect * h and w > width // 2:
+            bands.append((x, y, w, h))
+    if len(bands) < 2:
+        return None
+    
+    # Bottom-most two bands, padded by a quarter of their combined height
+    bands = sorted(bands, key=lambda band: band[1], reverse=True)[:2]
+    x0 = min(x for x, _, _, _ in bands)
+    x1 = max(x + w for x, _, w, _ in bands)
+    y0 = min(y for _, y, _, _ in bands)
+    y1 = max(y + h for _, y, _, h in bands)
+    padding = (y1 - y0) // 4
+    crop = gray[max(0, y0 - padding):min(height, y1 + padding), max(0, x0 - padding):min(width, x1 + padding)]
+    
+    scale = line_height / (sum(h for _, _, _, h in bands) / 2)
+    crop = cv2.resize(crop, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA if scale < 1 else cv2.INTER_CUBIC)
+    return cv2.threshold(crop, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)[1]
+
+
+def _get_mrz_line_database():
+    """Get this thread's compiled Hyperscan database (scratch space can't be shared between threads)"""
+    database = getattr(_thread_local, 'mrz_line_database', None)
+    if database is None:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[MRZ_FIRST_LINE_EXPRESSION.encode()],
+            ids=[0],
+            flags=[hyperscan.HS_FLAG_MULTILINE | hyperscan.HS_FLAG_SINGLEMATCH],
+        )
+        _thread_local.mrz_line_database = database
+    return database
+
+
+def _has_mrz_line(text):
+    """
+    Check in one linear pass whether OCR text contains a first MRZ line.
+    
+    Uses Hyperscan when installed, otherwise the equivalent regular expression.
+    
+    Args:
+        text (str): OCR output, spaces removed
+        
+    Returns:
+        bool: True if some line looks like the first line of an MRZ
+    """
+    if HYPERSCAN_AVAILABLE:
+        def on_match(pattern_id, start, end, flags, context):
+            return True  # Stop scanning at the first match
+        
+        try:
+            _get_mrz_line_database().scan(text.encode('ascii', 'ignore'), match_event_handler=on_match)
+        except hyperscan.ScanTerminated:
+            return True  # Raised when on_match stops the scan
+        return False
+    return MRZ_FIRST_LINE_REGEX.search(text) is not None
+
+
+def _stack_for_ocr(images, gap=40):
+    """
+    Stack image arrays vertically on a white canvas so they can be OCRed in one call.
+    
+    Args:
+        images (list): Image arrays with the same number of channels
+        gap (int): White rows between consecutive images
+        
+    Returns:
+        numpy.ndarray: Canvas as wide as the widest image
+    """
+    width = max(image.shape[1] for image in images)
+    height = sum(image.shape[0] for image in images) + gap * (len(images) - 1)
+    canvas = np.full((height, width) + images[0].shape[2:], 255, dtype=np.uint8)
+    y = 0
+    for image in images:
+        canvas[y:y + image.shape[0], :image.shape[1]] = image
+        y += image.shape[0] + gap
+    return canvas
+
+
+def _mrz_line_groups(text, min_length=30):
+    """
+    Split OCR text into candidate MRZs made of consecutive MRZ-shaped lines.
+    
+    Stacked bands are not reliably separated (or kept together) by blank lines
+    in the OCR output, so a candidate is any MRZ-shaped line that opens with a
+    document code and country, plus the one (TD3/TD2) or two (TD1) MRZ-shaped
+    lines after it.
+    
+    Args:
+        text (str): OCR output
+        min_length (int): Shortest line treated as an MRZ line
+        
+    Returns:
+        list: Newline-joined candidate MRZs, in reading order
+    """
+    lines = [line.strip().replace(" ", "") for line in text.splitlines()]
+    # Reject OCR garbage in one pass before splitting it into candidates
+    if not _has_mrz_line("\n".join(lines)):
+        return []
+    lines = [line for line in lines if len(line) >= min_length and "<" in line]
+    groups = []
+    for i, line in enumerate(lines):
+        if MRZ_FIRST_LINE_PATTERN.match(line):
+            size = 2 if len(line) >= 36 else 3
+            if i + size <= len(lines):
+                groups.append("\n".join(lines[i:i + size]))
+    return groups
+
+
+def _load_pdf_source(pdf_path):
+    """
+    Normalize a PDF source so it can be opened repeatedly (e.g. once per worker thread).
+    
+    Args:
+        pdf_path (str, bytes or file-like): Path to PDF file, raw PDF bytes, or a binary file object
+        
+    Returns:
+        str or bytes: The path unchanged, or the full PDF contents as bytes
+    """
+    if isinstance(pdf_path, (str, os.PathLike)):
+        return pdf_path
+    if isinstance(pdf_path, (bytes, bytearray, memoryview)):
+        return bytes(pdf_path)
+    if hasattr(pdf_path, 'getvalue'):
+        return pdf_path.getvalue()
+    return pdf_path.read()
+
+
+def _open_pdf_document(pdf_path):
+    """
+    Open a PDF with PyMuPDF from either a path or raw bytes.
+    
+    Args:
+        pdf_path (str or bytes): Path to PDF file or raw PDF bytes
+        
+    Returns:
+        fitz.Document: Opened document (caller must close it)
+    """
+    if isinstance(pdf_path, bytes):
+        return fitz.open(stream=pdf_path, filetype="pdf")
+    return fitz.open(pdf_path)
+
+
 def get_pdf_info(pdf_path):
     """
     Get PDF information (page count) using PyMuPDF or pdf2image as fallback.
     
     Args:
-        pdf_path (str): Path to PDF file
+        pdf_path (str or bytes): Path to PDF file or raw PDF bytes
         
     Returns:
         dict: Dictionary with 'Pages' key containing page count
     """
+    pdf_path = _load_pdf_source(pdf_path)
+    
     if PYMUPDF_AVAILABLE:
         try:
-            doc = fitz.open(pdf_path)
+            doc = _open_pdf_document(pdf_path)
             page_count = len(doc)
             doc.close()
             return {"Pages": page_count}
@@ -59,6 +664,8 @@ def get_pdf_info(pdf_path):
     # Fallback to pdf2image
     if pdfinfo_from_path:
         try:
+            if isinstance(pdf_path, bytes):
+                return pdfinfo_from_bytes(pdf_path)
             return pdfinfo_from_path(pdf_path)
         except Exception:
             pass
@@ -72,7 +679,7 @@ def convert_pdf_page_to_image(pdf_path, page_num, dpi=300, doc=None):
     Convert a single PDF page to PIL Image using PyMuPDF or pdf2image as fallback.
     
     Args:
-        pdf_path (str): Path to PDF file
+        pdf_path (str or bytes): Path to PDF file or raw PDF bytes
         page_num (int): Page number (1-indexed)
         dpi (int): DPI for conversion
         doc: Optional already-opened PyMuPDF document (for reuse)
@@ -85,7 +692,7 @@ def convert_pdf_page_to_image(pdf_path, page_num, dpi=300, doc=None):
         try:
             # Use provided document or open new one
             if doc is None:
-                doc = fitz.open(pdf_path)
+                doc = _open_pdf_document(pdf_path)
                 should_close = True
             
             if page_num > len(doc):
@@ -97,10 +704,13 @@ def convert_pdf_page_to_image(pdf_path, page_num, dpi=300, doc=None):
             page = doc[page_num - 1]  # 0-indexed
             zoom = dpi / 72.0
             mat = fitz.Matrix(zoom, zoom)
-            pix = page.get_pixmap(matrix=mat)
-            
-            # Convert to PIL Image
-            img = Image.frombytes("RGB", [pix.width, pix.height], pix.tobytes("ppm"))
+            if PDF_RENDER_GRAYSCALE:
+                # Single channel: a third of the pixel data to render, rotate and resize
+                pix = page.get_pixmap(matrix=mat, colorspace=fitz.csGRAY, alpha=False)
+                img = Image.frombytes("L", [pix.width, pix.height], pix.samples)
+            else:
+                pix = page.get_pixmap(matrix=mat, alpha=False)
+                img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
             
             # Only close if we opened it
             if should_close:
@@ -118,7 +728,10 @@ def convert_pdf_page_to_image(pdf_path, page_num, dpi=300, doc=None):
     # Fallback to pdf2image (can't reuse handle, so always open/close)
     if convert_from_path:
         try:
-            images = convert_from_path(pdf_path, first_page=page_num, last_page=page_num, dpi=dpi)
+            if isinstance(pdf_path, bytes):
+                images = convert_from_bytes(pdf_path, first_page=page_num, last_page=page_num, dpi=dpi)
+            else:
+                images = convert_from_path(pdf_path, first_page=page_num, last_page=page_num, dpi=dpi)
             if images:
                 return images[0]
         except Exception:
@@ -129,25 +742,33 @@ def convert_pdf_page_to_image(pdf_path, page_num, dpi=300, doc=None):
 
 def process_image(image_path, show_progress=False, use_fast_psm=False):
     """
-    Takes an image path and tries to find MRZ data by rotating it.
+    Takes an image and tries to find MRZ data by rotating it.
 
     Args:
-        image_path (str): The path to the image file to process.
+        image_path (str, bytes, file-like or PIL.Image): The path to the image file to process,
+            its raw bytes, a binary file object, or an already decoded image.
         show_progress (bool): If True, prints progress for each rotation attempt.
         use_fast_psm (bool): If True, use faster PSM mode (11 instead of 6) for speed optimization.
 
     Returns:
         dict: A dictionary containing the parsed MRZ data on success.
         None: If no valid MRZ data is found after all rotations.
+        
+    Raises:
+        OCRConfigurationError: If Tesseract or its language data can't be loaded
     """
     try:
-        # Use TESSERACT_PATH from environment, or empty string if not set (will use system PATH)
-        tesseract_path = TESSERACT_PATH if TESSERACT_PATH else ""
-        fast_mrz = FastMRZ(tesseract_path=tesseract_path)
+        fast_mrz = _get_fast_mrz()
         pytesseract.pytesseract.tesseract_cmd = TESSERACT_PATH if TESSERACT_PATH else pytesseract.pytesseract.tesseract_cmd
 
-        original_image = Image.open(image_path)
-        img_width, img_height = original_image.size
+        if isinstance(image_path, Image.Image):
+            original_image = image_path
+        else:
+            if isinstance(image_path, (bytes, bytearray, memoryview)):
+                image_path = BytesIO(image_path)
+            original_image = Image.open(image_path)
+        # Decode once; every rotation and crop below works on this array
+        original_array = _to_rgb_array(original_image)
 
         # Try rotations: 0, -90 (for pre-rotated images), 90
         # Most MRZ images are either 0 or -90 degrees, so prioritize those
@@ -157,74 +778,95 @@ def process_image(image_path, show_progress=False, use_fast_psm=False):
         else:
             rotations_to_try = [0, -90, 90]
         
+        # Quick pass: find the MRZ band with morphology and OCR only that strip.
+        # Much cheaper than the segmentation model, which remains the fallback below.
+        # Bands found at several rotations are stacked and OCRed in a single call.
+        band_angles = []
+        try:
+            bands = []
+            for angle in rotations_to_try:
+                band = find_mrz_band(_rotate_array(original_array, angle))
+                if band is not None:
+                    band_angles.append(angle)
+                    bands.append(band)
+            band_text = ocr_mrz_text(_stack_for_ocr(bands), psm_mode=6) if bands else ""
+        except OCRConfigurationError:
+            raise
+        except Exception:
+            band_text = ""
+        for group in _mrz_line_groups(band_text):
+            try:
+                mrz_text = fast_mrz.get_details(group, input_type="text", ignore_parse=True)
+                passport_mrz_json = fast_mrz.get_details(mrz_text, input_type="text", include_checkdigit=False)
+                if passport_mrz_json and (passport_mrz_json.get("document_number") or passport_mrz_json.get("given_name")):
+                    if show_progress:
+                        print("--- MRZ Data Found in detected MRZ band ---")
+                    passport_mrz_json['raw_text'] = mrz_text
+                    return passport_mrz_json
+            except Exception:
+                continue  # Unparseable band text, try the next group
+        
+        # A horizontal MRZ-like band is the orientation estimate: try the rotations
+        # where one was found first, so a sideways scan doesn't pay for the 0° pass
+        rotations_to_try = sorted(rotations_to_try, key=lambda angle: angle not in band_angles)
+        
         for angle in rotations_to_try:
             if show_progress:
                 print(f"--- Attempting to read MRZ at {angle} degrees rotation ---")
 
             try:
-                image_to_scan = original_image.rotate(-angle, expand=True)
-                scan_width, scan_height = image_to_scan.size
+                image_array = _rotate_array(original_array, angle)
+                scan_height = image_array.shape[0]
                 
-                # Try full image first
-                temp_image_path = None
+                # Try full image first (FastMRZ reads RGB pixel arrays directly, no temp file needed).
+                # Run segmentation + OCR once and parse the text, so raw_text comes from the same pass.
+                raw_text = fast_mrz.get_details(image_array, input_type="numpy", ignore_parse=True)
+
+                # The model still marks part of a sideways MRZ, so a first attempt with an
+                # empty mask means the image has none: skip the other rotations and the
+                # bottom-region pass
+                if not raw_text.strip() and angle == rotations_to_try[0] and fast_mrz.last_mask_fraction == 0:
+                    if show_progress:
+                        print("--- No MRZ region detected, skipping remaining rotations ---")
+                    break
+
+                passport_mrz_json = fast_mrz.get_details(raw_text, input_type="text", include_checkdigit=False)
+
+                # Check for a successful parse - accept even if checksum fails (status might be 'FAILURE' but data is extracted)
+                # Accept if we have document_number or given_name (some passports have empty surname)
+                if passport_mrz_json and (passport_mrz_json.get("document_number") or passport_mrz_json.get("given_name")):
+                    if show_progress:
+                        print("--- MRZ Data Found! ---")
+                    passport_mrz_json['raw_text'] = raw_text
+                    return passport_mrz_json
+                
+                # If parsing failed, retry on the same OCR text with each line stripped
+                # Sometimes OCR text parsing works better than image parsing
                 try:
-                    with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp_f:
-                        temp_image_path = temp_f.name
-                    
-                    image_to_scan.save(temp_image_path)
-                    
-                    passport_mrz_json = fast_mrz.get_details(temp_image_path, include_checkdigit=False)
-
-                    # Check for a successful parse - accept even if checksum fails (status might be 'FAILURE' but data is extracted)
-                    # Accept if we have document_number or given_name (some passports have empty surname)
+                    if raw_text and len(raw_text.strip()) > 10:
+                        cleaned_text = "\n".join([line.strip() for line in raw_text.strip().split("\n") if line.strip()])
+                        passport_mrz_json_text = fast_mrz.get_details(cleaned_text, input_type="text", include_checkdigit=False)
+                        if passport_mrz_json_text and (passport_mrz_json_text.get("document_number") or passport_mrz_json_text.get("given_name")):
+                            if show_progress:
+                                print("--- MRZ Data Found via text-based parsing! ---")
+                            passport_mrz_json_text['raw_text'] = cleaned_text
+                            return passport_mrz_json_text
+                except Exception:
+                    pass  # Continue to region checks if text parsing also fails
+                
+                # If fastmrz didn't find it on full image, try bottom 30% (MRZ is usually at bottom)
+                # Only try this for the upright image to save time
+                if angle == 0:
+                    bottom_array = image_array[int(scan_height * 0.7):scan_height]
+                    raw_text = fast_mrz.get_details(bottom_array, input_type="numpy", ignore_parse=True)
+                    passport_mrz_json = fast_mrz.get_details(raw_text, input_type="text", include_checkdigit=False)
                     if passport_mrz_json and (passport_mrz_json.get("document_number") or passport_mrz_json.get("given_name")):
                         if show_progress:
-                            print("--- MRZ Data Found! ---")
-                        # On success, also get the raw text and add it to the result
-                        raw_text = fast_mrz.get_details(temp_image_path, ignore_parse=True)
+                            print("--- MRZ Data Found in bottom region! ---")
                         passport_mrz_json['raw_text'] = raw_text
                         return passport_mrz_json
-                    
-                    # If image-based parsing failed, try text-based parsing as fallback
-                    # Sometimes OCR text parsing works better than image parsing
-                    raw_text_from_img = None
-                    try:
-                        raw_text_from_img = fast_mrz.get_details(temp_image_path, ignore_parse=True)
-                        if raw_text_from_img and len(raw_text_from_img.strip()) > 10:
-                            cleaned_text = "\n".join([line.strip() for line in raw_text_from_img.strip().split("\n") if line.strip()])
-                            passport_mrz_json_text = fast_mrz.get_details(cleaned_text, input_type="text", include_checkdigit=False)
-                            if passport_mrz_json_text and (passport_mrz_json_text.get("document_number") or passport_mrz_json_text.get("given_name")):
-                                if show_progress:
-                                    print("--- MRZ Data Found via text-based parsing! ---")
-                                passport_mrz_json_text['raw_text'] = cleaned_text
-                                return passport_mrz_json_text
-                    except Exception:
-                        pass  # Continue to region checks if text parsing also fails
-                    
-                    # If fastmrz didn't find it on full image, try bottom 30% (MRZ is usually at bottom)
-                    # Only try this for first rotation to save time
-                    if angle == 0:
-                        bottom_region = image_to_scan.crop((0, int(scan_height * 0.7), scan_width, scan_height))
-                        
-                        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp_f2:
-                            temp_bottom_path = temp_f2.name
-                        bottom_region.save(temp_bottom_path)
-                        
-                        try:
-                            passport_mrz_json = fast_mrz.get_details(temp_bottom_path, include_checkdigit=False)
-                            if passport_mrz_json and (passport_mrz_json.get("document_number") or passport_mrz_json.get("given_name")):
-                                if show_progress:
-                                    print("--- MRZ Data Found in bottom region! ---")
-                                raw_text = fast_mrz.get_details(temp_bottom_path, ignore_parse=True)
-                                passport_mrz_json['raw_text'] = raw_text
-                                return passport_mrz_json
-                        finally:
-                            if os.path.exists(temp_bottom_path):
-                                os.remove(temp_bottom_path)
-
-                finally:
-                    if temp_image_path and os.path.exists(temp_image_path):
-                        os.remove(temp_image_path)
+            except OCRConfigurationError:
+                raise
             except Exception as rotation_error:
                 # If this rotation fails, continue to next rotation
                 if show_progress:
@@ -236,9 +878,6 @@ def process_image(image_path, show_progress=False, use_fast_psm=False):
             print("--- Trying direct OCR with MRZ language ---")
         
         try:
-            original_image = Image.open(image_path)
-            img_width, img_height = original_image.size
-            
             # Prioritize most likely scenarios: rotated bottom region first (most common case)
             # Only try 90° rotation for fallback OCR
             ocr_rotations = [
@@ -249,20 +888,21 @@ def process_image(image_path, show_progress=False, use_fast_psm=False):
                 if show_progress:
                     print(f"--- Trying OCR with {rot_name} rotation ({rot_angle}°) ---")
                 
-                rotated_img = original_image.rotate(rot_angle, expand=True)
-                rot_width, rot_height = rotated_img.size
+                # rot_angle is counterclockwise
+                rotated_img = _rotate_array(original_array, -rot_angle)
+                rot_height = rotated_img.shape[0]
                 
                 # Define regions based on rotation
                 if rot_angle == 0:
                     # Normal: check bottom
                     regions_to_try = [
-                        ("bottom_30", rotated_img.crop((0, int(rot_height * 0.7), rot_width, rot_height))),
+                        ("bottom_30", rotated_img[int(rot_height * 0.7):]),
                         ("full", rotated_img),
                     ]
                 elif rot_angle == 90:
                     # Rotated left: check bottom (original right) and full image
                     regions_to_try = [
-                        ("bottom_30_rotated", rotated_img.crop((0, int(rot_height * 0.7), rot_width, rot_height))),
+                        ("bottom_30_rotated", rotated_img[int(rot_height * 0.7):]),
                         ("full_rotated", rotated_img),
                     ]
                 else:
@@ -274,16 +914,13 @@ def process_image(image_path, show_progress=False, use_fast_psm=False):
                         # Try direct OCR with MRZ language
                         # Use faster PSM mode if specified
                         psm_mode = OCR_PSM_MODE_FAST if use_fast_psm else OCR_PSM_MODE
-                        custom_config = f'--oem 3 --psm {psm_mode} -l mrz'
-                        raw_mrz_text = pytesseract.image_to_string(region_img, config=custom_config)
+                        raw_mrz_text = ocr_mrz_text(region_img, psm_mode)
                         
                         if raw_mrz_text and len(raw_mrz_text.strip()) > 10:
                             # Clean up the text
                             cleaned_text = "\n".join([line.strip() for line in raw_mrz_text.strip().split("\n") if line.strip()])
                             
                             # Try to parse the raw text
-                            tesseract_path = TESSERACT_PATH if TESSERACT_PATH else ""
-                            fast_mrz = FastMRZ(tesseract_path=tesseract_path)
                             passport_mrz_json = fast_mrz.get_details(cleaned_text, input_type="text", include_checkdigit=False)
                             
                             if passport_mrz_json and (passport_mrz_json.get("document_number") or passport_mrz_json.get("given_name")):
@@ -291,98 +928,197 @@ def process_image(image_path, show_progress=False, use_fast_psm=False):
                                     print(f"--- MRZ Data Found via direct OCR in {region_name} region! ---")
                                 passport_mrz_json['raw_text'] = cleaned_text
                                 return passport_mrz_json
+                    except OCRConfigurationError:
+                        raise
                     except Exception:
                         continue
+        except OCRConfigurationError:
+            raise
         except Exception as direct_ocr_error:
             if show_progress:
                 print(f"Direct OCR attempt failed: {str(direct_ocr_error)}")
         
         return None
 
+    except OCRConfigurationError:
+        raise
     except Exception as e:
         return {"error": str(e)}
 
 
-def _process_single_page(pdf_path, page_num, total_pages, show_progress=False, doc=None, use_fast_dpi=False):
+def _render_page_for_ocr(pdf_path, page_num, dpi, doc=None, show_progress=False):
     """
-    Helper function to process a single PDF page.
-    Used for parallel processing.
+    Render a PDF page and shrink it to MAX_IMAGE_DIMENSION if needed.
+    
+    Returns:
+        PIL.Image: Page image or None if conversion fails
+    """
+    image = convert_pdf_page_to_image(pdf_path, page_num, dpi, doc=doc)
+    if not image:
+        return None
+    
+    # Optimize image size - resize very large images to speed up OCR
+    img_width, img_height = image.size
+    max_dim = max(img_width, img_height)
+    if max_dim > MAX_IMAGE_DIMENSION:
+        # Calculate scaling factor to reduce image size
+        scale_factor = MAX_IMAGE_DIMENSION / max_dim
+        new_width = int(img_width * scale_factor)
+        new_height = int(img_height * scale_factor)
+        if show_progress:
+            print(f"Resizing image from {img_width}x{img_height} to {new_width}x{new_height} for faster OCR...")
+        # INTER_AREA is the proper anti-aliasing filter for downscaling and much faster than LANCZOS
+        image = Image.fromarray(cv2.resize(np.asarray(image), (new_width, new_height), interpolation=cv2.INTER_AREA))
+    return image
+
+
+def _scan_page(pdf_path, page_num, total_pages, show_progress=False, doc=None, use_fast_dpi=False):
+    """
+    Render and scan a single PDF page (exceptions propagate to the caller).
+    
+    Pages are first rendered at PDF_DPI_FAST. Only when that fails and the MRZ
+    segmentation model still sees an MRZ-like band is the page re-rendered at PDF_DPI.
     
     Args:
-        pdf_path (str): Path to PDF file
+        pdf_path (str or bytes): Path to PDF file or raw PDF bytes
         page_num (int): Page number to process (1-indexed)
         total_pages (int): Total number of pages in PDF
         show_progress (bool): Whether to show progress
         doc: Optional already-opened PyMuPDF document (for reuse)
-        use_fast_dpi (bool): If True, use lower DPI for faster processing
+        use_fast_dpi (bool): If True, use the faster PSM mode (priority pages)
         
     Returns:
         dict: MRZ data if found, None otherwise
     """
-    try:
-        if show_progress:
-            print(f"\n--- Processing page {page_num} of {total_pages} ---")
-        
-        # Use lower DPI for faster processing if specified (e.g., for priority pages)
-        dpi = PDF_DPI_FAST if use_fast_dpi else PDF_DPI
-        if show_progress and use_fast_dpi:
-            print(f"Using fast DPI ({dpi}) for faster processing...")
-        
-        # Convert specific page to image with DPI from configuration
-        image = convert_pdf_page_to_image(pdf_path, page_num, dpi, doc=doc)
-        
-        if not image:
+    if show_progress:
+        print(f"\n--- Processing page {page_num} of {total_pages} ---")
+    
+    # Check the page's text layer before rasterizing: a born-digital MRZ can be
+    # parsed straight from it, and text-only pages (no images) can't hold a scanned one
+    if doc is not None and page_num <= len(doc):
+        page = doc[page_num - 1]
+        page_text = page.get_text("text")
+        if page_text.count('<') > 20:
+            try:
+                mrz_text = _get_fast_mrz().get_details(page_text, input_type="text", ignore_parse=True)
+                result = _get_fast_mrz().get_details(mrz_text, input_type="text", include_checkdigit=False)
+                if result and (result.get("document_number") or result.get("given_name")):
+                    result['raw_text'] = mrz_text
+                    result['page_number'] = page_num
+                    result['total_pages'] = total_pages
+                    if show_progress:
+                        print(f"MRZ data found in the text layer of page {page_num}!")
+                    return result
+            except Exception:
+                pass  # Fall back to OCR
+        elif page_text.strip() and not page.get_images():
             if show_progress:
-                print(f"Could not convert page {page_num} to image.")
+                print(f"Page {page_num} is text only, skipping.")
             return None
-        
-        # Optimize image size - resize very large images to speed up OCR
-        img_width, img_height = image.size
-        max_dim = max(img_width, img_height)
-        if max_dim > MAX_IMAGE_DIMENSION:
-            # Calculate scaling factor to reduce image size
-            scale_factor = MAX_IMAGE_DIMENSION / max_dim
-            new_width = int(img_width * scale_factor)
-            new_height = int(img_height * scale_factor)
+    
+    if show_progress:
+        print(f"Using fast DPI ({PDF_DPI_FAST}) for the first pass...")
+    
+    # Convert specific page to image at the fast DPI
+    image = _render_page_for_ocr(pdf_path, page_num, PDF_DPI_FAST, doc=doc, show_progress=show_progress)
+    
+    if not image:
+        if show_progress:
+            print(f"Could not convert page {page_num} to image.")
+        return None
+    
+    # Save page 3 as a permanent file for inspection (debug only)
+    if SAVE_PAGE3_INSPECTION and page_num == 3:
+        pdf_name = os.path.basename(pdf_path).replace('.pdf', '') if isinstance(pdf_path, (str, os.PathLike)) else 'document'
+        inspection_path = f"page_3_inspection_{pdf_name}.png"
+        image.save(inspection_path, 'PNG', compress_level=1)
+        if show_progress:
+            print(f"Saved page 3 for inspection: {inspection_path}")
+    
+    # Process this page (disable progress for parallel processing to avoid output conflicts)
+    # Use faster PSM mode for priority pages
+    result = process_image(image, show_progress=False, use_fast_psm=use_fast_dpi)
+    if result and "error" in result:
+        raise RuntimeError(result["error"])
+    
+    # Second pass at full DPI, only for pages that look like they hold an MRZ
+    # and only if the larger render wouldn't just be shrunk back down
+    found = result and (result.get("document_number") or result.get("given_name"))
+    if not found and PDF_DPI > PDF_DPI_FAST:
+        upscaled_dim = max(image.size) * PDF_DPI / PDF_DPI_FAST
+        if upscaled_dim <= MAX_IMAGE_DIMENSION and _get_fast_mrz().has_mrz_region(_to_rgb_array(image)):
             if show_progress:
-                print(f"Resizing image from {img_width}x{img_height} to {new_width}x{new_height} for faster OCR...")
-            image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+                print(f"Page {page_num} looks like it has an MRZ, retrying at {PDF_DPI} DPI...")
+            image = _render_page_for_ocr(pdf_path, page_num, PDF_DPI, doc=doc, show_progress=show_progress)
+            if image:
+                result = process_image(image, show_progress=False, use_fast_psm=use_fast_dpi)
+                if result and "error" in result:
+                    raise RuntimeError(result["error"])
+    
+    # If MRZ data found, add page number and return
+    if result and (result.get("document_number") or result.get("given_name")):
+        result['page_number'] = page_num
+        result['total_pages'] = total_pages
+        if show_progress:
+            print(f"MRZ data found on page {page_num}!")
+        return result
+    else:
+        if show_progress:
+            print(f"No MRZ data found on page {page_num}.")
+        return None
+
+
+def _process_single_page(pdf_path, page_num, total_pages, show_progress=False, doc=None, use_fast_dpi=False, fingerprint=None):
+    """
+    Helper function to process a single PDF page.
+    Used for parallel processing.
+    
+    Results (including "no MRZ") are cached on disk when MRZ_CACHE_DIR is set.
+    
+    Args:
+        pdf_path (str or bytes): Path to PDF file or raw PDF bytes
+        page_num (int): Page number to process (1-indexed)
+        total_pages (int): Total number of pages in PDF
+        show_progress (bool): Whether to show progress
+        doc: Optional already-opened PyMuPDF document (for reuse)
+        use_fast_dpi (bool): If True, use the faster PSM mode (priority pages)
+        fingerprint (str): _pdf_fingerprint of the PDF, if the caller already computed it
         
-        # Save page to temporary file
-        temp_page_path = None
-        try:
-            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp_f:
-                temp_page_path = temp_f.name
-            image.save(temp_page_path, 'PNG')
-            
-            # Save page 3 as a permanent file for inspection
-            if page_num == 3:
-                inspection_path = f"page_3_inspection_{os.path.basename(pdf_path).replace('.pdf', '')}.png"
-                image.save(inspection_path, 'PNG')
-                if show_progress:
-                    print(f"Saved page 3 for inspection: {inspection_path}")
-            
-            # Process this page (disable progress for parallel processing to avoid output conflicts)
-            # Use faster PSM mode for priority pages
-            result = process_image(temp_page_path, show_progress=False, use_fast_psm=use_fast_dpi)
-            
-            # If MRZ data found, add page number and return
-            if result and (result.get("document_number") or result.get("given_name")):
-                result['page_number'] = page_num
-                result['total_pages'] = total_pages
-                if show_progress:
-                    print(f"MRZ data found on page {page_num}!")
-                return result
-            else:
+    Returns:
+        dict: MRZ data if found, None otherwise
+    """
+    try:
+        cache = _get_page_cache()
+        cache_key = None
+        if cache is not None:
+            cache_key = _page_cache_key(fingerprint or _pdf_fingerprint(pdf_path), page_num, use_fast_dpi)
+            cached = cache.get(cache_key)
+            if cached is not None:
                 if show_progress:
-                    print(f"No MRZ data found on page {page_num}.")
-                return None
-                
+                    print(f"Using cached result for page {page_num}.")
+                return None if cached == _NO_MRZ_CACHED else cached
+        
+        # Open the document here when the caller didn't pass one, so the text
+        # layer check and rendering share a handle
+        owns_doc = False
+        if doc is None and PYMUPDF_AVAILABLE:
+            try:
+                doc = _open_pdf_document(pdf_path)
+                owns_doc = True
+            except Exception:
+                doc = None
+        try:
+            result = _scan_page(pdf_path, page_num, total_pages, show_progress, doc, use_fast_dpi)
         finally:
-            # Cleanup temporary page file
-            if temp_page_path and os.path.exists(temp_page_path):
-                os.remove(temp_page_path)
-                
+            if owns_doc:
+                doc.close()
+        
+        if cache_key is not None:
+            cache.set(cache_key, result if result else _NO_MRZ_CACHED)
+        return result
+    except OCRConfigurationError:
+        # Every page would fail the same way; let process_pdf report it
+        raise
     except Exception as e:
         if show_progress:
             print(f"Error processing page {page_num}: {str(e)}")
@@ -397,7 +1133,8 @@ def process_pdf(pdf_path, show_progress=False, max_pages=None, parallel=True, st
     then page 1, then remaining pages.
     
     Args:
-        pdf_path (str): The path to the PDF file to process.
+        pdf_path (str, bytes or file-like): The path to the PDF file to process,
+            its raw bytes, or a binary file object.
         show_progress (bool): If True, prints progress for each page and rotation attempt.
         max_pages (int): Maximum number of pages to check. If None, checks all pages.
         parallel (bool): If True, process pages in parallel. Default: True.
@@ -413,9 +1150,21 @@ def process_pdf(pdf_path, show_progress=False, max_pages=None, parallel=True, st
     """
     doc = None
     try:
+        # Read in-memory sources once so each page/thread can reopen them
+        pdf_path = _load_pdf_source(pdf_path)
+        # Identify the PDF once for the page cache rather than hashing it per page
+        fingerprint = _pdf_fingerprint(pdf_path) if _get_page_cache() is not None else None
+        
+        # Open the document once: it gives the page count (no separate get_pdf_info open)
+        # and serves the start page and every sequential page below
+        if PYMUPDF_AVAILABLE:
+            try:
+                doc = _open_pdf_document(pdf_path)
+            except Exception:
+                doc = None  # Fallback to opening per page if this fails
+        
         # Get total number of pages in PDF
-        pdf_info = get_pdf_info(pdf_path)
-        total_pages = pdf_info.get("Pages", 1)
+        total_pages = len(doc) if doc is not None else get_pdf_info(pdf_path).get("Pages", 1)
         
         # Limit pages to check if max_pages is specified
         pages_to_check = min(total_pages, max_pages) if max_pages else total_pages
@@ -439,15 +1188,8 @@ def process_pdf(pdf_path, show_progress=False, max_pages=None, parallel=True, st
             if show_progress:
                 print(f"Checking start_page {start_page} first...")
             
-            # Open document for sequential check
-            if PYMUPDF_AVAILABLE:
-                try:
-                    doc = fitz.open(pdf_path)
-                except Exception:
-                    doc = None
-            
             # Check start_page first (use fast DPI for speed optimization)
-            result = _process_single_page(pdf_path, start_page, total_pages, show_progress, doc, use_fast_dpi=True)
+            result = _process_single_page(pdf_path, start_page, total_pages, show_progress, doc, use_fast_dpi=True, fingerprint=fingerprint)
             if result and (result.get("document_number") or result.get("given_name")):
                 if doc is not None:
                     try:
@@ -497,56 +1239,44 @@ def process_pdf(pdf_path, show_progress=False, max_pages=None, parallel=True, st
                 # Single page: just check page 1
                 remaining_pages = [1]
         
-        # Open PDF document once for reuse (only if PyMuPDF is available and sequential)
-        if PYMUPDF_AVAILABLE and not parallel:
-            if doc is None:
-                try:
-                    doc = fitz.open(pdf_path)
-                except Exception:
-                    doc = None  # Fallback to opening per page if this fails
-        
         # Use parallel processing only for PDFs with 3+ pages (overhead not worth it for 1-2 pages)
-        use_parallel = parallel and len(remaining_pages) >= 3
+        use_parallel = parallel and PDF_PAGE_WORKERS > 1 and len(remaining_pages) >= 3
         
         if show_progress and use_parallel:
             print(f"Using parallel processing for {len(remaining_pages)} remaining page(s)...")
         
         # Use parallel processing for multiple pages
         if use_parallel:
-            # For parallel processing, each thread opens its own document handle
-            # (PyMuPDF documents are not thread-safe for concurrent access)
-            with ThreadPoolExecutor(max_workers=min(len(remaining_pages), 4)) as executor:
-                # Submit all remaining pages for processing in priority order
-                future_to_page = {}
-                for page_num in remaining_pages:
-                    future = executor.submit(_process_single_page, pdf_path, page_num, total_pages, show_progress, None)
-                    future_to_page[future] = page_num
-                
-                # Process results as they complete (first result wins)
-                found_result = None
-                for future in as_completed(future_to_page):
-                    page_num = future_to_page[future]
-                    try:
-                        result = future.result()
-                        if result and (result.get("document_number") or result.get("given_name")):
-                            # Found MRZ - cancel remaining tasks and return
-                            if show_progress:
-                                print(f"MRZ found on page {page_num}, canceling remaining tasks...")
-                            found_result = result
-                            # Cancel all remaining futures
-                            for remaining_future in future_to_page:
-                                if remaining_future != future:
-                                    remaining_future.cancel()
-                            if doc is not None:
-                                try:
-                                    doc.close()
-                                except:
-                                    pass
-                            return found_result
-                    except Exception as e:
+            # Processes (not threads) so every page gets its own single-threaded Tesseract.
+            # In-memory PDFs are handed over once in shared memory; tasks carry only
+            # its name, and each worker reads and opens the document once for all
+            # of its pages of this scan.
+            pool, pending_pages = _get_page_pool()
+            scan_id = next(_page_scan_ids)
+            slot = scan_id % PAGE_SCAN_SLOTS
+            shared_pdf = None
+            pdf_source = pdf_path
+            if isinstance(pdf_path, bytes):
+                shared_pdf = shared_memory.SharedMemory(create=True, size=max(1, len(pdf_path)))
+                shared_pdf.buf[:len(pdf_path)] = pdf_path
+                pdf_source = (shared_pdf.name, len(pdf_path))
+            pending_pages[slot] = len(remaining_pages)
+            scan_page = partial(_process_worker_page, scan_id, pdf_source, total_pages=total_pages, show_progress=show_progress, fingerprint=fingerprint)
+            try:
+                # Pages are handed out in priority order; results arrive as they complete (first result wins)
+                for page_num, result in pool.imap_unordered(scan_page, remaining_pages):
+                    if result and (result.get("document_number") or result.get("given_name")):
                         if show_progress:
-                            print(f"Error processing page {page_num}: {str(e)}")
-                        continue
+                            print(f"MRZ found on page {page_num}, canceling remaining tasks...")
+                        return result
+            finally:
+                # Workers skip this scan's pages that haven't started yet. Pages already
+                # being scanned finish, but the shared pool keeps running for other scans.
+                with pending_pages.get_lock():
+                    pending_pages[slot] = 0
+                if shared_pdf is not None:
+                    shared_pdf.close()
+                    shared_pdf.unlink()
             
             # No MRZ data found in any page
             if show_progress:
@@ -561,7 +1291,7 @@ def process_pdf(pdf_path, show_progress=False, max_pages=None, parallel=True, st
             # Sequential processing (for single page or if parallel disabled)
             # Reuse document handle for better performance
             for page_num in remaining_pages:
-                result = _process_single_page(pdf_path, page_num, total_pages, show_progress, doc)
+                result = _process_single_page(pdf_path, page_num, total_pages, show_progress, doc, fingerprint=fingerprint)
                 if result and (result.get("document_number") or result.get("given_name")):
                     if doc is not None:
                         try:
@@ -593,10 +1323,125 @@ def process_pdf(pdf_path, show_progress=False, max_pages=None, parallel=True, st
                 pass
 
 
+def scan_file(input_file_path, show_progress=False, max_pages=None, parallel=True, start_page=None, start_page_only=False):
+    """
+    Scan an image or PDF file on disk, timing the scan.
+    
+    Args:
+        input_file_path (str): Path to the image or PDF file
+        show_progress (bool): If True, prints progress while scanning
+        max_pages (int): Maximum number of PDF pages to check (None uses MAX_PAGES_DEFAULT)
+        parallel (bool): If True, process PDF pages in parallel
+        start_page (int): Optional PDF page to check first (1-indexed)
+        start_page_only (bool): If True, only check start_page
+        
+    Returns:
+        tuple: (result dict or None, processing time in seconds rounded to 2 places)
+    """
+    final_result = None
+    start_time = time.perf_counter()
+
+    try:
+        if not os.path.exists(input_file_path):
+            raise FileNotFoundError(f"The file was not found: {input_file_path}")
+
+        if input_file_path.lower().endswith('.pdf'):
+            if show_progress:
+                print(f"PDF file detected: '{input_file_path}'")
+            # Use the given page limit if provided, otherwise use env default, otherwise None (all pages)
+            max_pages = max_pages if max_pages is not None else MAX_PAGES_DEFAULT
+            final_result = process_pdf(input_file_path, show_progress, max_pages, parallel=parallel, start_page=start_page, start_page_only=start_page_only)
+        else:
+            if show_progress:
+                print(f"\nProcessing image: '{input_file_path}'...")
+            final_result = process_image(input_file_path, show_progress)
+
+    except Exception as e:
+        final_result = {"error": str(e)}
+    
+    # Calculate processing time
+    processing_time = time.perf_counter() - start_time
+    processing_time_rounded = round(processing_time, 2)
+    
+    # Add processing time to result data (for text format display)
+    if final_result and isinstance(final_result, dict):
+        final_result['processing_time_seconds'] = processing_time_rounded
+    
+    return final_result, processing_time_rounded
+
+
+def format_json_result(final_result, processing_time_rounded):
+    """
+    Build the JSON output document (status, data/message, processing time) for a scan result.
+    
+    Args:
+        final_result (dict or None): Result returned by scan_file
+        processing_time_rounded (float): Processing time in seconds
+        
+    Returns:
+        dict: Output document for --format json
+    """
+    if final_result and "error" in final_result:
+        return {
+            "status": "error", 
+            "message": final_result["error"],
+            "processing_time_seconds": processing_time_rounded
+        }
+    if final_result:
+        # Remove processing_time from data to avoid duplication, keep it at root level
+        result_data = final_result.copy()
+        result_data.pop('processing_time_seconds', None)
+        return {
+            "status": "success", 
+            "data": result_data,
+            "processing_time_seconds": processing_time_rounded
+        }
+    return {
+        "status": "failure", 
+        "message": "Could not find any valid MRZ data after trying all pages and rotations.",
+        "processing_time_seconds": processing_time_rounded
+    }
+
+
+def run_batch(input_stream, output_stream, parallel=True):
+    """
+    Serve scan requests from a stream, one JSON object per line, so callers
+    pay for interpreter startup and model loading only once.
+    
+    Each request line looks like {"input_file": "doc.pdf", "max_pages": 5,
+    "start_page": 3, "start_page_only": false} (only input_file is required).
+    Each response is the --format json document for that file, written on a
+    single line and flushed immediately.
+    
+    Args:
+        input_stream (file-like): Text stream of request lines (e.g. sys.stdin)
+        output_stream (file-like): Text stream for response lines (e.g. sys.stdout)
+        parallel (bool): If True, process PDF pages in parallel
+    """
+    for line in input_stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+            final_result, processing_time_rounded = scan_file(
+                request["input_file"],
+                max_pages=request.get("max_pages"),
+                parallel=parallel,
+                start_page=request.get("start_page"),
+                start_page_only=bool(request.get("start_page_only", False)),
+            )
+            output_json = format_json_result(final_result, processing_time_rounded)
+        except Exception as e:
+            output_json = {"status": "error", "message": f"Invalid batch request: {str(e)}"}
+        output_stream.write(json.dumps(output_json) + "\n")
+        output_stream.flush()
+
+
 # --- Main script execution starts here ---
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Scan an image or PDF for Machine-Readable Zone (MRZ) data.")
-    parser.add_argument("input_file", help="Path to the image or PDF file to be scanned.")
+    parser.add_argument("input_file", nargs="?", help="Path to the image or PDF file to be scanned (omit with --batch).")
     parser.add_argument(
         "--format",
         choices=["text", "json"],
@@ -625,65 +1470,29 @@ if __name__ == "__main__":
         action="store_true",
         help="Disable parallel processing for PDF files."
     )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Read JSON scan requests from stdin (one per line) and write one JSON result per line to stdout."
+    )
     args = parser.parse_args()
 
-    show_progress = args.format == 'text'
-    
-    input_file_path = args.input_file
-    final_result = None
-    start_time = time.time()
+    if args.batch:
+        run_batch(sys.stdin, sys.stdout, parallel=not args.no_parallel)
+        sys.exit(0)
+    if not args.input_file:
+        parser.error("input_file is required unless --batch is given")
 
-    try:
-        if not os.path.exists(input_file_path):
-            raise FileNotFoundError(f"The file was not found: {input_file_path}")
-
-        if input_file_path.lower().endswith('.pdf'):
-            if show_progress:
-                print(f"PDF file detected: '{input_file_path}'")
-            # Use command-line argument if provided, otherwise use env default, otherwise None (all pages)
-            max_pages = args.max_pages if args.max_pages is not None else MAX_PAGES_DEFAULT
-            final_result = process_pdf(input_file_path, show_progress, max_pages, parallel=not args.no_parallel, start_page=args.start_page, start_page_only=args.start_page_only)
-        else:
-            if show_progress:
-                print(f"\nProcessing image: '{input_file_path}'...")
-            final_result = process_image(input_file_path, show_progress)
-
-    except Exception as e:
-        final_result = {"error": str(e)}
-    
-    # Calculate processing time
-    processing_time = time.time() - start_time
-    processing_time_rounded = round(processing_time, 2)
+    show_progress = args.format == 'text'
     
-    # Add processing time to result data (for text format display)
-    if final_result and isinstance(final_result, dict):
-        final_result['processing_time_seconds'] = processing_time_rounded
+    final_result, processing_time_rounded = scan_file(
+        args.input_file, show_progress, args.max_pages, parallel=not args.no_parallel,
+        start_page=args.start_page, start_page_only=args.start_page_only
+    )
 
     # --- Final Output ---
     if args.format == 'json':
-        output_json = {}
-        if final_result and "error" in final_result:
-            output_json = {
-                "status": "error", 
-                "message": final_result["error"],
-                "processing_time_seconds": processing_time_rounded
-            }
-        elif final_result:
-            # Remove processing_time from data to avoid duplication, keep it at root level
-            result_data = final_result.copy()
-            result_data.pop('processing_time_seconds', None)
-            output_json = {
-                "status": "success", 
-                "data": result_data,
-                "processing_time_seconds": processing_time_rounded
-            }
-        else:
-            output_json = {
-                "status": "failure", 
-                "message": "Could not find any valid MRZ data after trying all pages and rotations.",
-                "processing_time_seconds": processing_time_rounded
-            }
-        print(json.dumps(output_json, indent=4))
+        print(json.dumps(format_json_result(final_result, processing_time_rounded), indent=4))
     else:
         if final_result and (final_result.get("document_number") or final_result.get("given_name")):
              print("\n--- JSON Data ---")
@@ -0,0 +1,8 @@
+"""Shared pytest setup: make the scanner module and the API importable"""
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT_DIR, os.path.join(ROOT_DIR, 'api')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
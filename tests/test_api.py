@@ -0,0 +1,108 @@
+"""Tests for the Flask API's request validation and error paths (no OCR involved)"""
+import base64
+import io
+
+import pytest
+
+import app as api
+
+
+@pytest.fixture
+def client():
+    api.app.config['TESTING'] = True
+    return api.app.test_client()
+
+
+@pytest.fixture
+def small_upload_limit(monkeypatch):
+    monkeypatch.setattr(api, 'MAX_UPLOAD_BYTES', 1000)
+    return 1000
+
+
+def test_scan_file_rejects_file_over_limit(client, small_upload_limit):
+    data = {'file': (io.BytesIO(b'x' * (small_upload_limit + 1)), 'big.jpg')}
+    response = client.post('/scan/file', data=data, content_type='multipart/form-data')
+    assert response.status_code == 413
+    assert response.get_json()['status'] == 'error'
+
+
+def test_scan_base64_rejects_payload_over_limit(client, small_upload_limit):
+    payload = base64.b64encode(b'x' * (small_upload_limit + 10)).decode()
+    response = client.post('/scan/base64', json={'file': payload, 'filename': 'big.jpg'})
+    assert response.status_code == 413
+
+
+def test_health(client):
+    response = client.get('/health')
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('body, message', [
+    ({}, "Request must be JSON"),
+    ([1, 2], "Request must be JSON"),
+    ({'filename': 'a.jpg'}, "Missing 'file'"),
+    ({'file': 123, 'filename': 'a.jpg'}, "'file' must be a base64 encoded string"),
+    ({'file': 'aGk=', 'filename': 5}, "'filename' must be a string"),
+    ({'file': '###', 'filename': 'a.jpg'}, "Invalid base64 encoding"),
+    ({'file': 'data:text/plain,hi', 'filename': 'a.jpg'}, "Invalid base64 encoding"),
+])
+def test_scan_base64_bad_requests(client, body, message):
+    response = client.post('/scan/base64', json=body)
+    assert response.status_code == 400
+    assert response.get_json()['status'] == 'error'
+    assert message in response.get_json()['message']
+
+
+def test_scan_file_requires_file(client):
+    response = client.post('/scan/file', data={}, content_type='multipart/form-data')
+    assert response.status_code == 400
+    assert "Missing 'file'" in response.get_json()['message']
+
+
+def test_scan_url_requires_url(client):
+    response = client.post('/scan/url', json={})
+    assert response.status_code == 400
+    assert "Missing 'url'" in response.get_json()['message']
+
+
+def test_body_over_content_length_is_413(client, monkeypatch):
+    monkeypatch.setitem(api.app.config, 'MAX_CONTENT_LENGTH', 100)
+    response = client.post('/scan/base64', json={'file': 'A' * 200, 'filename': 'a.jpg'})
+    assert response.status_code == 413
+    assert response.get_json()['status'] == 'error'
+
+
+@pytest.fixture
+def api_keys(monkeypatch):
+    monkeypatch.setattr(api, 'API_KEYS', frozenset({'good-key'}))
+
+
+def test_missing_api_key_is_401(client, api_keys):
+    response = client.post('/scan/url', json={})
+    assert response.status_code == 401
+    assert 'Authentication required' in response.get_json()['message']
+
+
+def test_invalid_api_key_is_401(client, api_keys):
+    response = client.post('/scan/url', json={}, headers={'X-API-Key': 'bad-key'})
+    assert response.status_code == 401
+    assert 'Invalid API key' in response.get_json()['message']
+
+
+@pytest.mark.parametrize('headers', [{'X-API-Key': 'good-key'}, {'Authorization': 'Bearer good-key'}])
+def test_valid_api_key_is_accepted(client, api_keys, headers):
+    response = client.post('/scan/url', json={}, headers=headers)
+    assert response.status_code == 400  # Past authentication, rejected for the missing url
+
+
+def test_health_skips_authentication(client, api_keys):
+    assert client.get('/health').status_code == 200
+
+
+def test_rate_limit_is_429(client, monkeypatch):
+    monkeypatch.setattr(api, 'rate_limiter', api.SlidingWindowLimiter())
+    limit, _ = api.parse_rate_limit(api.RATE_LIMIT_PER_KEY)
+    statuses = [client.post('/scan/url', json={}).status_code for _ in range(limit + 1)]
+    assert statuses[:limit] == [400] * limit
+    assert statuses[-1] == 429
+    assert client.post('/scan/url', json={}).get_json()['status'] == 'error'
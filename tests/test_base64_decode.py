@@ -0,0 +1,56 @@
+"""Tests for streaming base64 decoding of /scan/base64 payloads"""
+import base64
+import io
+
+import pytest
+
+import app as api
+
+PAYLOAD = bytes(range(256)) * 40
+
+
+def decode(data):
+    buffer = io.BytesIO()
+    api.decode_base64_to_file(data, buffer)
+    return buffer.getvalue()
+
+
+@pytest.fixture(params=[8, 12, 87380])
+def chunk_chars(request, monkeypatch):
+    """Run each test with tiny chunks as well, so chunk boundaries are exercised"""
+    monkeypatch.setattr(api, 'BASE64_CHUNK_CHARS', request.param)
+    return request.param
+
+
+def test_decodes_str_and_bytes(chunk_chars):
+    encoded = base64.b64encode(PAYLOAD)
+    assert decode(encoded) == PAYLOAD
+    assert decode(encoded.decode()) == PAYLOAD
+
+
+def test_ignores_whitespace_across_chunks(chunk_chars):
+    encoded = base64.encodebytes(PAYLOAD).decode()  # Wrapped at 76 characters
+    assert decode(encoded) == PAYLOAD
+    assert decode(' \t'.join(encoded[i:i + 5] for i in range(0, len(encoded), 5))) == PAYLOAD
+
+
+def test_strips_data_uri_prefix(chunk_chars):
+    encoded = base64.b64encode(PAYLOAD).decode()
+    assert decode('data:application/pdf;base64,' + encoded) == PAYLOAD
+
+
+def test_rejects_non_base64_data_uri():
+    with pytest.raises(ValueError):
+        decode('data:text/plain,hello')
+
+
+@pytest.mark.parametrize('data', ['###', 'YWJj$GVm', 'YWJjZA'])
+def test_rejects_invalid_or_truncated_input(chunk_chars, data):
+    with pytest.raises(ValueError):
+        decode(data)
+
+
+def test_rejects_non_ascii():
+    with pytest.raises(ValueError):
+        decode('YWJjé')
+
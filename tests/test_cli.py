@@ -0,0 +1,97 @@
+"""Tests for CLI output building, batch mode and OCR setup error reporting"""
+import io
+import json
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import mrz_scanner
+
+
+def test_format_json_result_success_moves_processing_time_to_root():
+    output = mrz_scanner.format_json_result({'surname': 'DOE', 'processing_time_seconds': 1.5}, 1.5)
+    assert output == {'status': 'success', 'data': {'surname': 'DOE'}, 'processing_time_seconds': 1.5}
+
+
+def test_format_json_result_error_and_failure():
+    assert mrz_scanner.format_json_result({'error': 'boom'}, 0.1) == {
+        'status': 'error', 'message': 'boom', 'processing_time_seconds': 0.1}
+    output = mrz_scanner.format_json_result(None, 0.2)
+    assert output['status'] == 'failure'
+    assert output['processing_time_seconds'] == 0.2
+
+
+def test_run_batch_writes_one_line_per_request(monkeypatch):
+    calls = []
+    
+    def fake_scan_file(input_file, **kwargs):
+        calls.append((input_file, kwargs))
+        if input_file == 'found.pdf':
+            return {'surname': 'DOE', 'processing_time_seconds': 0.5}, 0.5
+        return None, 0.25
+    
+    monkeypatch.setattr(mrz_scanner, 'scan_file', fake_scan_file)
+    requests = '\n'.join([
+        json.dumps({'input_file': 'found.pdf', 'start_page': 3, 'max_pages': 5}),
+        '',
+        json.dumps({'input_file': 'empty.jpg', 'start_page_only': True}),
+        'not json',
+        json.dumps({'max_pages': 2}),
+    ])
+    output = io.StringIO()
+    mrz_scanner.run_batch(io.StringIO(requests), output, parallel=False)
+    
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [line['status'] for line in lines] == ['success', 'failure', 'error', 'error']
+    assert lines[0]['data'] == {'surname': 'DOE'}
+    assert 'Invalid batch request' in lines[2]['message']
+    assert calls[0] == ('found.pdf', {'max_pages': 5, 'parallel': False, 'start_page': 3, 'start_page_only': False})
+    assert calls[1][1]['start_page_only'] is True
+
+
+@pytest.fixture
+def broken_ocr(monkeypatch):
+    """Make every OCR call fail the way a missing language file does"""
+    def fail(*args, **kwargs):
+        raise mrz_scanner.OCRConfigurationError("Tesseract could not load language 'mrz'")
+    
+    monkeypatch.setattr(mrz_scanner, 'ocr_mrz_text', fail)
+    # A blank image has no MRZ region, so force the OCR paths to run
+    monkeypatch.setattr(mrz_scanner, 'find_mrz_band', lambda image_array: np.full((32, 400), 255, dtype=np.uint8))
+
+
+def test_ocr_setup_error_is_raised_not_reported_as_no_mrz(broken_ocr):
+    with pytest.raises(mrz_scanner.OCRConfigurationError):
+        mrz_scanner.process_image(Image.new('RGB', (600, 400), 'white'))
+
+
+def test_ocr_setup_error_reaches_pdf_result(broken_ocr, monkeypatch):
+    def fake_scan_page(*args, **kwargs):
+        return mrz_scanner.process_image(Image.new('RGB', (600, 400), 'white'))
+    
+    monkeypatch.setattr(mrz_scanner, '_scan_page', fake_scan_page)
+    monkeypatch.setattr(mrz_scanner, '_get_page_cache', lambda: None)
+    fitz = pytest.importorskip('fitz')
+    doc = fitz.open()
+    doc.new_page()
+    result = mrz_scanner.process_pdf(doc.tobytes(), parallel=False)
+    assert 'could not load language' in result['error']
+
+
+def test_tesseract_init_failure_is_cached(monkeypatch):
+    if not mrz_scanner.TESSEROCR_AVAILABLE:
+        pytest.skip("tesserocr not installed")
+    attempts = []
+    
+    def failing_api(*args, **kwargs):
+        attempts.append(1)
+        raise RuntimeError("Failed to init API, possibly an invalid tessdata path")
+    
+    monkeypatch.setattr(mrz_scanner, 'PyTessBaseAPI', failing_api)
+    monkeypatch.setattr(mrz_scanner, '_tesseract_init_error', None)
+    monkeypatch.setattr(mrz_scanner, '_thread_local', type(mrz_scanner._thread_local)())
+    for _ in range(2):
+        with pytest.raises(mrz_scanner.OCRConfigurationError):
+            mrz_scanner.ocr_mrz_text(np.zeros((10, 10), dtype=np.uint8))
+    assert len(attempts) == 1
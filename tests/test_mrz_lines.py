@@ -0,0 +1,40 @@
+"""Tests for the MRZ line prefilter and candidate grouping"""
+import re
+
+import pytest
+
+import mrz_scanner
+
+TD3_LINE_1 = "P<GBRST<HELENA<SPECIMEN<<ANGELA<ZOE<<<<<<<<<"
+TD3_LINE_2 = "7606415605GBR8809117F2503103<<<<<<<<<<<<<<08"
+
+
+@pytest.mark.skipif(not mrz_scanner.HYPERSCAN_AVAILABLE, reason="hyperscan not installed")
+def test_has_mrz_line_hyperscan_path(monkeypatch):
+    # A regex that never matches, so only Hyperscan can report the line
+    monkeypatch.setattr(mrz_scanner, 'MRZ_FIRST_LINE_REGEX', re.compile(r'(?!)'))
+    assert mrz_scanner._has_mrz_line(f"noise\n{TD3_LINE_1}\n{TD3_LINE_2}")
+    assert not mrz_scanner._has_mrz_line("noise\nmore noise")
+
+
+def test_has_mrz_line_regex_fallback(monkeypatch):
+    monkeypatch.setattr(mrz_scanner, 'HYPERSCAN_AVAILABLE', False)
+    assert mrz_scanner._has_mrz_line(f"noise\n{TD3_LINE_1}\n{TD3_LINE_2}")
+    assert not mrz_scanner._has_mrz_line(TD3_LINE_2)
+    assert not mrz_scanner._has_mrz_line("")
+
+
+def test_mrz_line_groups_finds_td3_pair():
+    text = f"noise line\n{TD3_LINE_1[:20]} {TD3_LINE_1[20:]}\n{TD3_LINE_2}\n"
+    assert mrz_scanner._mrz_line_groups(text) == [f"{TD3_LINE_1}\n{TD3_LINE_2}"]
+
+
+def test_mrz_line_groups_finds_td1_triple():
+    lines = ["I<UTOD231458907<<<<<<<<<<<<<<<", "7408122F1204159UTO<<<<<<<<<<<6", "ERIKSSON<<ANNA<MARIA<<<<<<<<<<"]
+    assert mrz_scanner._mrz_line_groups("\n".join(lines)) == ["\n".join(lines)]
+
+
+def test_mrz_line_groups_rejects_garbage_and_incomplete_mrz():
+    assert mrz_scanner._mrz_line_groups("") == []
+    assert mrz_scanner._mrz_line_groups("some text\nno machine readable zone") == []
+    assert mrz_scanner._mrz_line_groups(TD3_LINE_1) == []  # Second line missing
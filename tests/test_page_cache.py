@@ -0,0 +1,73 @@
+"""Tests for the per-page result cache used by process_pdf"""
+import pytest
+
+import mrz_scanner
+
+fitz = pytest.importorskip('fitz')
+
+
+class DictCache(dict):
+    """In-memory stand-in for diskcache.Cache"""
+    
+    def set(self, key, value):
+        self[key] = value
+
+
+@pytest.fixture
+def blank_pdf():
+    doc = fitz.open()
+    for _ in range(3):
+        doc.new_page()
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+@pytest.fixture
+def scans(monkeypatch):
+    """Replace page scanning with a recorder and the disk cache with a dict"""
+    scanned = []
+    cache = DictCache()
+    fingerprints = []
+    real_fingerprint = mrz_scanner._pdf_fingerprint
+    
+    def fake_scan_page(pdf_path, page_num, *args, **kwargs):
+        scanned.append(page_num)
+        return None
+    
+    def counting_fingerprint(pdf_path):
+        fingerprints.append(pdf_path)
+        return real_fingerprint(pdf_path)
+    
+    monkeypatch.setattr(mrz_scanner, '_scan_page', fake_scan_page)
+    monkeypatch.setattr(mrz_scanner, '_get_page_cache', lambda: cache)
+    monkeypatch.setattr(mrz_scanner, '_pdf_fingerprint', counting_fingerprint)
+    return scanned, fingerprints
+
+
+def test_negative_results_are_cached(blank_pdf, scans):
+    scanned, _ = scans
+    assert mrz_scanner.process_pdf(blank_pdf, parallel=False) is None
+    assert sorted(scanned) == [1, 2, 3]
+    assert mrz_scanner.process_pdf(blank_pdf, parallel=False) is None
+    assert sorted(scanned) == [1, 2, 3]  # Second run served from the cache
+
+
+def test_fingerprint_computed_once_per_scan(blank_pdf, scans):
+    _, fingerprints = scans
+    mrz_scanner.process_pdf(blank_pdf, parallel=False)
+    assert len(fingerprints) == 1
+
+
+@pytest.mark.parametrize('setting, value', [
+    ('OCR_LANG', 'ocrb+mrz'),
+    ('PDF_RENDER_GRAYSCALE', True),
+    ('MRZ_OCR_LINE_HEIGHT', 48),
+    ('PAGE_CACHE_VERSION', -1),
+])
+def test_settings_change_invalidates_cache(blank_pdf, scans, monkeypatch, setting, value):
+    scanned, _ = scans
+    mrz_scanner.process_pdf(blank_pdf, parallel=False)
+    monkeypatch.setattr(mrz_scanner, setting, value)
+    mrz_scanner.process_pdf(blank_pdf, parallel=False)
+    assert len(scanned) == 6
@@ -0,0 +1,63 @@
+"""Tests for the per-scan state of PDF page worker processes (run in-process)"""
+import multiprocessing
+from multiprocessing import shared_memory
+
+import pytest
+
+import mrz_scanner
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    """Set up this process as a page worker whose page scans are recorded"""
+    pending_pages = multiprocessing.Array('i', mrz_scanner.PAGE_SCAN_SLOTS)
+    scanned = []
+    
+    def fake_process_single_page(pdf_path, page_num, total_pages, show_progress=False, doc=None, use_fast_dpi=False, fingerprint=None):
+        scanned.append((pdf_path, page_num))
+        return None
+    
+    monkeypatch.setattr(mrz_scanner, '_worker_pending_pages', pending_pages)
+    monkeypatch.setattr(mrz_scanner, '_process_single_page', fake_process_single_page)
+    monkeypatch.setattr(mrz_scanner, 'PYMUPDF_AVAILABLE', False)
+    yield pending_pages, scanned
+    mrz_scanner._release_worker_pdf()
+
+
+@pytest.fixture
+def shared_pdf():
+    data = b'%PDF-1.4 test document'
+    memory = shared_memory.SharedMemory(create=True, size=len(data))
+    memory.buf[:len(data)] = data
+    yield (memory.name, len(data)), data
+    memory.close()
+    memory.unlink()
+
+
+def test_reads_shared_pdf_once_and_releases_it_after_last_page(worker, shared_pdf):
+    pending_pages, scanned = worker
+    source, data = shared_pdf
+    pending_pages[7] = 2
+    
+    mrz_scanner._process_worker_page(7, source, 1, 2)
+    assert mrz_scanner._worker_scan_id == 7
+    mrz_scanner._process_worker_page(7, ('no-such-memory', 1), 2, 2)  # Not read again
+    
+    assert scanned == [(data, 1), (data, 2)]
+    assert pending_pages[7] == 0
+    assert mrz_scanner._worker_pdf is None and mrz_scanner._worker_scan_id is None
+
+
+def test_skips_pages_of_ended_scans(worker, shared_pdf):
+    pending_pages, scanned = worker
+    source, _ = shared_pdf
+    pending_pages[3] = 0
+    assert mrz_scanner._process_worker_page(3, source, 1, 3) == (1, None)
+    assert scanned == []
+
+
+def test_file_sources_are_used_as_paths(worker):
+    pending_pages, scanned = worker
+    pending_pages[1] = 1
+    mrz_scanner._process_worker_page(1, '/tmp/document.pdf', 1, 1)
+    assert scanned == [('/tmp/document.pdf', 1)]
@@ -0,0 +1,76 @@
+"""Tests for the API's in-process sliding window rate limiter"""
+import pytest
+
+import app as api
+
+
+class FakeClock:
+    """Manually advanced replacement for time.monotonic"""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def limiter(clock):
+    return api.SlidingWindowLimiter(clock=clock)
+
+
+def test_blocks_after_limit(limiter):
+    assert all(limiter.hit('k', 3, 60) for _ in range(3))
+    assert not limiter.hit('k', 3, 60)
+    # Other keys have their own counters
+    assert limiter.hit('other', 3, 60)
+
+
+def test_sliding_estimate_weights_previous_window(limiter, clock):
+    assert all(limiter.hit('k', 10, 100) for _ in range(10))
+    # Start of the next window: the whole previous window still counts
+    clock.now = 100.0
+    assert not limiter.hit('k', 10, 100)
+    # Halfway through: the previous 10 count as 5, so 5 more are allowed
+    clock.now = 150.0
+    assert sum(limiter.hit('k', 10, 100) for _ in range(10)) == 5
+    # After a full idle window the old counts no longer apply
+    clock.now = 400.0
+    assert all(limiter.hit('k', 10, 100) for _ in range(10))
+
+
+def test_prune_keeps_long_window_keys(limiter, clock, monkeypatch):
+    monkeypatch.setattr(limiter, 'MAX_TRACKED_KEYS', 1)
+    assert limiter.hit('health', 1, 3600)
+    # A short-window key triggers pruning long after its own window
+    clock.now = 10.0
+    assert limiter.hit('scan', 5, 1)
+    # The hourly counter must survive, so its limit still applies
+    assert not limiter.hit('health', 1, 3600)
+
+
+def test_prune_drops_idle_keys(limiter, clock, monkeypatch):
+    monkeypatch.setattr(limiter, 'MAX_TRACKED_KEYS', 1)
+    assert limiter.hit('scan', 1, 1)
+    clock.now = 10.0
+    assert limiter.hit('health', 1, 3600)
+    assert 'scan' not in limiter._windows
+
+
+@pytest.mark.parametrize('limit_str, expected', [
+    ("100 per hour", (100, 3600)),
+    ("10/minute", (10, 60)),
+    ("50 per 5 minutes", (50, 300)),
+])
+def test_parse_rate_limit(limit_str, expected):
+    assert api.parse_rate_limit(limit_str) == expected
+
+
+def test_parse_rate_limit_rejects_garbage():
+    with pytest.raises(ValueError):
+        api.parse_rate_limit("lots")